@@ -1,37 +1,45 @@
+import contextlib
 import os
+import sys
 import traceback
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import Body, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
-from pydantic import BaseModel
+from fastapi.responses import Response
 from mitigation.city_infrastructure_network import mitigate
 
-app = FastAPI()
+# Modules that keep a shared aiohttp session (under either import name)
+_SESSION_MODULES = (
+    "earthquake_api", "Earthquake.earthquake_api",
+    "earthquake_predictor", "Earthquake.earthquake_predictor",
+    "flood_api", "Flood.flood_api",
+)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: close the shared HTTP sessions of any lane module that was used
+    for name in _SESSION_MODULES:
+        module = sys.modules.get(name)
+        if module is not None:
+            with contextlib.suppress(Exception):
+                await module.close_session()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=False,
-    allow_methods=["GET", "POST", "OPTIONS", "PUT", "DELETE"],
+    allow_methods=["*"],
     allow_headers=["*"],
     expose_headers=["*"],
 )
 
 
-# Fallback OPTIONS handler in case middleware doesn't catch it
-@app.options("/{rest_of_path:path}")
-async def preflight_handler(request: Request, rest_of_path: str):
-    return Response(
-        status_code=200,
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers": "*",
-        },
-    )
-
-
 @app.get("/health")
 def health():
     """Quick health check so the frontend knows the backend is reachable."""
@@ -45,21 +53,27 @@ def health():
     }
 
 
-class CityRequest(BaseModel):
-    city: str
+def _orjson_response(payload, status_code: int = 200) -> Response:
+    """Serialize payload with orjson, bypassing FastAPI's jsonable_encoder."""
+    return Response(
+        content=orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        status_code=status_code,
+        media_type="application/json",
+    )
 
 
 @app.post("/run_pipeline")
-def run_pipeline(req: CityRequest):
+def run_pipeline(city: str = Body(..., embed=True)):
+    """Run the full pipeline for a city. Body: {"city": "<name>"}."""
     try:
         from main import receive
-        analysis = receive(req.city)
-        return {"status": "ok", "analysis": analysis}
+        analysis = receive(city)
+        return _orjson_response({"status": "ok", "analysis": analysis})
     except Exception as e:
         traceback.print_exc()
-        return JSONResponse(
+        return _orjson_response(
+            {"status": "error", "detail": f"{type(e).__name__}: {e}"},
             status_code=500,
-            content={"status": "error", "detail": f"{type(e).__name__}: {e}"},
         )
 
 
@@ -71,21 +85,21 @@ def mitigate_pipeline():
         os.path.dirname(__file__), "Data", "apocalypse_analysis.json"
     )
     if not os.path.exists(analysis_path):
-        return JSONResponse(
-            status_code=400,
-            content={
+        return _orjson_response(
+            {
                 "status": "error",
                 "detail": (
                     "apocalypse_analysis.json not found. "
                     "Run the pipeline for a city first via POST /run_pipeline."
                 ),
             },
+            status_code=400,
         )
     try:
-        return mitigate()
+        return _orjson_response(mitigate())
     except Exception as e:
         traceback.print_exc()
-        return JSONResponse(
+        return _orjson_response(
+            {"status": "error", "detail": f"{type(e).__name__}: {e}"},
             status_code=500,
-            content={"status": "error", "detail": f"{type(e).__name__}: {e}"},
         )
\ No newline at end of file
@@ -16,14 +16,77 @@ Usage:
 
     # Get details for a specific earthquake
     quake = get_earthquake_by_id("us7000n123")
+
+    # From async code (e.g. a FastAPI endpoint), without blocking the loop
+    quakes = await get_earthquakes_async(lat=37.77, lng=-122.42, radius_km=500)
+
+    # Several regions at once (requests run concurrently)
+    sf, tokyo = await get_earthquakes_batch([
+        {"lat": 37.77, "lng": -122.42, "radius_km": 500},
+        {"lat": 35.68, "lng": 139.69, "radius_km": 300},
+    ])
 """
 
+import asyncio
+import contextlib
+import time
+import aiohttp
+import msgspec
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 BASE_URL = "https://earthquake.usgs.gov/fdsnws/event/1"
 
+# Query results are cached in-process for CACHE_TTL_SECONDS. Expired entries are
+# kept (up to CACHE_MAX_ENTRIES) and served as a stale fallback if USGS fails.
+CACHE_TTL_SECONDS = 300
+CACHE_MAX_ENTRIES = 256
+_cache: dict[tuple, tuple[float, list[dict]]] = {}
+
+
+# Typed GeoJSON schema: msgspec decodes USGS responses straight into these
+# structs (validating types in the same pass); unknown fields are ignored.
+class _Properties(msgspec.Struct):
+    mag: Optional[float] = None
+    place: Optional[str] = None
+    time: Optional[int] = None
+    alert: Optional[str] = None
+    tsunami: Optional[int] = None
+    url: Optional[str] = None
+
+
+class _Geometry(msgspec.Struct):
+    coordinates: Optional[list[Optional[float]]] = None
+
+
+class _Feature(msgspec.Struct):
+    id: Optional[str] = None
+    properties: _Properties = msgspec.field(default_factory=_Properties)
+    geometry: Optional[_Geometry] = None
+
+
+class _FeatureCollection(msgspec.Struct):
+    features: list[_Feature] = msgspec.field(default_factory=list)
+
+
+_decode_collection = msgspec.json.Decoder(_FeatureCollection).decode
+_decode_feature = msgspec.json.Decoder(_Feature).decode
+
+# Coordinates for features without geometry
+_NO_COORDS = (None, None, None)
+
+# Shared requests session for the sync API: pooled keep-alive connections to
+# USGS (no TCP/TLS handshake per call) and two quick retries on connect errors
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2)))
+
+# Shared aiohttp session for the async API, bound to the loop that created it
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
 
 def get_earthquakes(
     lat: float,
@@ -57,6 +120,7 @@ def get_earthquakes(
             mag        (float) : Magnitude
             place      (str)   : Human-readable location description
             time       (str)   : ISO 8601 UTC timestamp
+            time_ms    (int)   : Same timestamp as epoch milliseconds
             lat        (float) : Epicenter latitude
             lng        (float) : Epicenter longitude
             depth_km   (float) : Depth in kilometers
@@ -67,6 +131,145 @@ def get_earthquakes(
     Raises:
         ValueError: If lat/lng are out of valid range.
     """
+    params = _build_params(lat, lng, radius_km, min_mag, max_mag, days_back, start_date, end_date, limit)
+    key = _cache_key(params)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        resp = _http.get(f"{BASE_URL}/query", params=params, timeout=15)
+        resp.raise_for_status()
+        data = _decode_collection(resp.content)
+    except requests.RequestException as e:
+        print(f"[earthquake_api] Request failed: {e}")
+        return _cache_get(key, allow_stale=True) or []
+    except msgspec.DecodeError:
+        print("[earthquake_api] Failed to parse JSON response")
+        return _cache_get(key, allow_stale=True) or []
+
+    return _cache_put(key, _parse_features(data.features))
+
+
+async def get_earthquakes_async(
+    lat: float,
+    lng: float,
+    radius_km: int = 250,
+    min_mag: float = 2.5,
+    max_mag: Optional[float] = None,
+    days_back: int = 30,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 100,
+) -> list[dict]:
+    """
+    Async version of get_earthquakes() — same arguments and return value.
+
+    Uses a shared aiohttp session so the calling event loop is never blocked
+    and several regions can be fetched concurrently.
+    """
+    params = _build_params(lat, lng, radius_km, min_mag, max_mag, days_back, start_date, end_date, limit)
+    key = _cache_key(params)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        session = await _get_session()
+        async with session.get(
+            f"{BASE_URL}/query", params=params, timeout=aiohttp.ClientTimeout(total=15)
+        ) as resp:
+            resp.raise_for_status()
+            data = _decode_collection(await resp.read())
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"[earthquake_api] Request failed: {e}")
+        return _cache_get(key, allow_stale=True) or []
+    except msgspec.DecodeError:
+        print("[earthquake_api] Failed to parse JSON response")
+        return _cache_get(key, allow_stale=True) or []
+
+    return _cache_put(key, _parse_features(data.features))
+
+
+async def get_earthquakes_batch(queries: list[dict]) -> list[list[dict]]:
+    """
+    Fetch several regions concurrently.
+
+    Args:
+        queries: List of keyword-argument dicts for get_earthquakes_async(),
+                 e.g. [{"lat": 37.77, "lng": -122.42, "radius_km": 300}, ...].
+
+    Returns:
+        One list of earthquake dicts per query, in the same order.
+        A failed query yields an empty list, as with get_earthquakes().
+    """
+    return list(await asyncio.gather(*(get_earthquakes_async(**q) for q in queries)))
+
+
+async def close_session():
+    """Close the shared aiohttp session (call on application shutdown)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session, (re)creating it on the running loop.
+    A session still open from an earlier loop is closed once replaced.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        # Swap before awaiting, so concurrent callers share the new session
+        old = _session
+        _session = aiohttp.ClientSession()
+        _session_loop = loop
+        if old is not None and not old.closed:
+            with contextlib.suppress(RuntimeError):  # its loop may be closed already
+                await old.close()
+    return _session
+
+
+def _cache_key(params: dict) -> tuple:
+    """Cache key for a query: coordinates rounded to ~1 km, date window by day."""
+    key = dict(params, latitude=round(params["latitude"], 2), longitude=round(params["longitude"], 2))
+    return tuple(sorted(key.items()))
+
+
+def _cache_get(key: tuple, allow_stale: bool = False) -> Optional[list[dict]]:
+    """Return a copy of the cached result for key, or None if missing/expired."""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    fetched_at, quakes = entry
+    if not allow_stale and time.monotonic() - fetched_at > CACHE_TTL_SECONDS:
+        return None
+    return list(quakes)
+
+
+def _cache_put(key: tuple, quakes: list[dict]) -> list[dict]:
+    """Store a fresh result (evicting the oldest entry if full) and return it."""
+    _cache.pop(key, None)
+    _cache[key] = (time.monotonic(), quakes)
+    if len(_cache) > CACHE_MAX_ENTRIES:
+        del _cache[next(iter(_cache))]
+    return list(quakes)
+
+
+def _build_params(
+    lat: float,
+    lng: float,
+    radius_km: int,
+    min_mag: float,
+    max_mag: Optional[float],
+    days_back: int,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    limit: int,
+) -> dict:
+    """Validate inputs and build the USGS query parameters."""
     if not (-90 <= lat <= 90):
         raise ValueError(f"Latitude must be between -90 and 90, got {lat}")
     if not (-180 <= lng <= 180):
@@ -94,19 +297,7 @@ def get_earthquakes(
     }
     if max_mag is not None:
         params["maxmagnitude"] = max_mag
-
-    try:
-        resp = requests.get(f"{BASE_URL}/query", params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
-        print(f"[earthquake_api] Request failed: {e}")
-        return []
-    except ValueError:
-        print("[earthquake_api] Failed to parse JSON response")
-        return []
-
-    return _parse_features(data.get("features", []))
+    return params
 
 
 def get_earthquake_by_id(event_id: str) -> Optional[dict]:
@@ -124,44 +315,43 @@ def get_earthquake_by_id(event_id: str) -> Optional[dict]:
         "eventid": event_id,
     }
     try:
-        resp = requests.get(f"{BASE_URL}/query", params=params, timeout=15)
+        resp = _http.get(f"{BASE_URL}/query", params=params, timeout=15)
         resp.raise_for_status()
-        data = resp.json()
+        feature = _decode_feature(resp.content)
     except requests.RequestException as e:
         print(f"[earthquake_api] Request failed: {e}")
         return None
-
-    features = data.get("features", [])
-    if not features:
+    except msgspec.DecodeError:
+        print("[earthquake_api] Failed to parse JSON response")
         return None
-    return _parse_features(features)[0]
 
+    # An eventid query returns a single GeoJSON Feature, not a FeatureCollection
+    return _parse_features([feature])[0]
 
-def _parse_features(features: list) -> list[dict]:
-    """Parse GeoJSON features into clean earthquake dicts."""
+
+def _parse_features(features: list[_Feature]) -> list[dict]:
+    """Parse decoded GeoJSON features into clean earthquake dicts."""
+    utc = timezone.utc
+    fromtimestamp = datetime.fromtimestamp
     results = []
+    append = results.append
     for f in features:
-        props = f.get("properties", {})
-        coords = f.get("geometry", {}).get("coordinates", [None, None, None])
-
-        ts = props.get("time")
-        time_str = (
-            datetime.fromtimestamp(ts / 1000, tz=timezone.utc).isoformat()
-            if ts
-            else None
-        )
-
-        results.append({
-            "id": f.get("id"),
-            "mag": props.get("mag"),
-            "place": props.get("place"),
-            "time": time_str,
+        props = f.properties
+        coords = (f.geometry and f.geometry.coordinates) or _NO_COORDS
+        ts = props.time
+
+        append({
+            "id": f.id,
+            "mag": props.mag,
+            "place": props.place,
+            "time": fromtimestamp(ts / 1000, tz=utc).isoformat() if ts else None,
+            "time_ms": ts,
             "lat": coords[1],
             "lng": coords[0],
             "depth_km": coords[2],
-            "alert": props.get("alert"),
-            "tsunami": bool(props.get("tsunami")),
-            "detail_url": props.get("url"),
+            "alert": props.alert,
+            "tsunami": bool(props.tsunami),
+            "detail_url": props.url,
         })
     return results
 
@@ -9,7 +9,9 @@ Outputs to Data/earthquake_coordinates.json
 
 import os
 import sys
-import json
+
+import numpy as np
+import orjson
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
@@ -17,18 +19,18 @@ PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
 OUTPUT_FILE = os.path.join(PROJECT_ROOT, "Data", "earthquake_coordinates.json")
 
 RISK_RANK = {"Low": 0, "Medium": 1, "High": 2, "Critical": 3}
+RISK_LEVELS = ("Low", "Medium", "High", "Critical")  # indexed by rank
+MAG_THRESHOLDS = np.array([4.0, 5.0, 6.0])  # lower bounds of Medium/High/Critical
+
+# Coordinates are grouped on an int64 key built from the 4 dp lat/lng (the
+# output key) in 1e-4 degree units
+COORD_SCALE = 10_000
+KEY_LNG_SPAN = 4_000_000  # > 2 * 180 * COORD_SCALE, so keys never collide
 
 
 def mag_to_risk(mag: float) -> str:
-    """Convert earthquake magnitude to risk level."""
-    if mag >= 6.0:
-        return "Critical"
-    elif mag >= 5.0:
-        return "High"
-    elif mag >= 4.0:
-        return "Medium"
-    else:
-        return "Low"
+    """Convert earthquake magnitude to risk level (scalar form of the digitize in generate_map)."""
+    return RISK_LEVELS[int(mag >= 4.0) + int(mag >= 5.0) + int(mag >= 6.0)]
 
 
 def generate_map(events: list) -> dict:
@@ -41,27 +43,41 @@ def generate_map(events: list) -> dict:
     Returns:
         Dict of "lat,lng" → "Low"/"Medium"/"High"/"Critical".
     """
-    coord_map = {}
-
-    for e in events:
-        lat = e.get("lat")
-        lng = e.get("lng")
-        mag = e.get("mag")
+    # round(x, 4) up front: the int keys below are exact multiples of 1e-4, so
+    # events share a group exactly when they share an output "lat,lng" string
+    rows = [
+        (round(e["lat"], 4), round(e["lng"], 4), e["mag"])
+        for e in events
+        if e.get("lat") is not None and e.get("lng") is not None and e.get("mag") is not None
+    ]
 
-        if lat is None or lng is None or mag is None:
-            continue
-
-        key = f"{round(lat, 4)},{round(lng, 4)}"
-        level = mag_to_risk(mag)
-
-        if key in coord_map:
-            if RISK_RANK.get(level, 0) > RISK_RANK.get(coord_map[key], 0):
-                coord_map[key] = level
-        else:
-            coord_map[key] = level
-
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(coord_map, f, indent=2)
+    coord_map = {}
+    if rows:
+        lats, lngs, mags = np.array(rows, dtype=np.float64).T
+        keys = (
+            np.round(lats * COORD_SCALE).astype(np.int64) * KEY_LNG_SPAN
+            + np.round(lngs * COORD_SCALE).astype(np.int64)
+        )
+        ranks = np.digitize(mags, MAG_THRESHOLDS)
+
+        # Group identical coordinates and keep the highest risk rank per group
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        max_ranks = np.maximum.reduceat(ranks[order], starts)
+
+        # Emit groups in first-seen order (stable sort => group start is earliest)
+        first_seen = order[starts]
+        for g in np.argsort(first_seen):
+            lat, lng, _ = rows[first_seen[g]]
+            coord_map[f"{lat},{lng}"] = RISK_LEVELS[max_ranks[g]]
+
+    # Compact orjson bytes, written to a temp file and swapped in atomically so
+    # the globe never fetches a half-written map
+    tmp_file = f"{OUTPUT_FILE}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(coord_map, option=orjson.OPT_APPEND_NEWLINE))
+    os.replace(tmp_file, OUTPUT_FILE)
 
     print(f"[earthquake_mapper] Saved {len(coord_map)} coordinates → {OUTPUT_FILE}")
     return coord_map
\ No newline at end of file
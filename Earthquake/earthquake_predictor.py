@@ -16,17 +16,28 @@ Usage:
     processed = preprocess(raw, location_name="San Francisco, CA")
     prediction = predict_risk(processed)
     print(prediction)
+
+    # From async code, without blocking the event loop
+    result = await predict_risk_full_async(lat=37.77, lng=-122.42, location_name="San Francisco, CA")
 """
 
 import os
+import re
 import sys
-import json
+import asyncio
+import contextlib
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
+from llm_cache import cache_key, load_cached, save_cached
+
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 DEFAULT_MODEL = "llama-3.3-70b-versatile"
 
@@ -51,11 +62,26 @@ Assessment criteria:
 
 Consider: frequency trends, magnitude distribution, depth profiles, geographic clustering, and temporal acceleration when making your assessment."""
 
+# JSON object inside a ```json (or bare ```) markdown fence in the LLM reply
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.S)
+
+# Shared requests session for the sync API: pooled keep-alive connections to
+# Groq (no TCP/TLS handshake per call) and two quick retries on connect errors
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2)))
+
+# Shared aiohttp session for the async API, bound to the loop that created it
+_session = None
+_session_loop = None
+
 
 def predict_risk(processed: dict, model: str = DEFAULT_MODEL) -> dict:
     """
     Send preprocessed earthquake data to Groq LLM for risk assessment.
 
+    Successful responses are cached on disk by request content (see
+    llm_cache), so an identical prompt within 30 minutes skips the API call.
+
     Args:
         processed: Output from earthquake_preprocessor.preprocess().
         model:     Groq model to use (default: llama-3.3-70b-versatile).
@@ -76,6 +102,92 @@ def predict_risk(processed: dict, model: str = DEFAULT_MODEL) -> dict:
     Raises:
         ValueError: If GROQ_API_KEY is not set.
     """
+    headers, payload = _build_request(processed, model)
+    if payload is None:
+        return {"error": "No LLM prompt found in processed data.", "risk_level": "UNKNOWN"}
+
+    key = cache_key(payload)
+    cached = load_cached(key)
+    if cached is not None:
+        return cached
+
+    try:
+        resp = _http.post(GROQ_API_URL, headers=headers, json=payload, timeout=30)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+    except requests.RequestException as e:
+        return {"error": f"Groq API request failed: {e}", "risk_level": "UNKNOWN"}
+    except orjson.JSONDecodeError:
+        return {"error": "Groq API returned invalid JSON", "risk_level": "UNKNOWN"}
+
+    result = _parse_response(data, model)
+    if result["error"] is None:
+        save_cached(key, result)
+    return result
+
+
+async def predict_risk_async(processed: dict, model: str = DEFAULT_MODEL) -> dict:
+    """
+    Async version of predict_risk() — same arguments and return value.
+
+    Uses a shared aiohttp session so the Groq round-trip does not block
+    the calling event loop.
+    """
+    headers, payload = _build_request(processed, model)
+    if payload is None:
+        return {"error": "No LLM prompt found in processed data.", "risk_level": "UNKNOWN"}
+
+    key = cache_key(payload)
+    cached = load_cached(key)
+    if cached is not None:
+        return cached
+
+    try:
+        session = await _get_session()
+        async with session.post(
+            GROQ_API_URL, headers=headers, json=payload, timeout=aiohttp.ClientTimeout(total=30)
+        ) as resp:
+            resp.raise_for_status()
+            data = orjson.loads(await resp.read())
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return {"error": f"Groq API request failed: {e}", "risk_level": "UNKNOWN"}
+    except orjson.JSONDecodeError:
+        return {"error": "Groq API returned invalid JSON", "risk_level": "UNKNOWN"}
+
+    result = _parse_response(data, model)
+    if result["error"] is None:
+        save_cached(key, result)
+    return result
+
+
+async def close_session():
+    """Close the shared aiohttp session (call on application shutdown)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session, (re)creating it on the running loop.
+    A session still open from an earlier loop is closed once replaced.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        # Swap before awaiting, so concurrent callers share the new session
+        old = _session
+        _session = aiohttp.ClientSession()
+        _session_loop = loop
+        if old is not None and not old.closed:
+            with contextlib.suppress(RuntimeError):  # its loop may be closed already
+                await old.close()
+    return _session
+
+
+def _build_request(processed: dict, model: str) -> tuple[dict, dict | None]:
+    """Build Groq request headers and payload (payload is None if there is no prompt)."""
     api_key = os.environ.get("GROQ_API_KEY_4")
     if not api_key:
         raise ValueError(
@@ -85,7 +197,7 @@ def predict_risk(processed: dict, model: str = DEFAULT_MODEL) -> dict:
 
     prompt = processed.get("llm_prompt", "")
     if not prompt:
-        return {"error": "No LLM prompt found in processed data.", "risk_level": "UNKNOWN"}
+        return {}, None
 
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -101,25 +213,18 @@ def predict_risk(processed: dict, model: str = DEFAULT_MODEL) -> dict:
         "temperature": 0.2,
         "max_tokens": 500,
     }
+    return headers, payload
 
-    try:
-        resp = requests.post(GROQ_API_URL, headers=headers, json=payload, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
-        return {"error": f"Groq API request failed: {e}", "risk_level": "UNKNOWN"}
 
+def _parse_response(data: dict, model: str) -> dict:
+    """Extract the JSON risk assessment from a Groq chat completion."""
     raw_text = data["choices"][0]["message"]["content"].strip()
 
     # Parse JSON from LLM response
+    m = _FENCE_RE.search(raw_text)
     try:
-        cleaned = raw_text
-        if "```" in cleaned:
-            cleaned = cleaned.split("```json")[-1].split("```")[0].strip()
-            if not cleaned:
-                cleaned = raw_text.split("```")[-2].strip()
-        result = json.loads(cleaned)
-    except (json.JSONDecodeError, IndexError):
+        result = orjson.loads(m.group(1) if m else raw_text)
+    except orjson.JSONDecodeError:
         return {
             "error": "Failed to parse LLM response as JSON",
             "risk_level": "UNKNOWN",
@@ -171,6 +276,55 @@ def predict_risk_full(
     }
 
 
+async def predict_risk_full_async(
+    lat: float,
+    lng: float,
+    location_name: str = "Unknown",
+    radius_km: int = 250,
+    min_mag: float = 2.5,
+    days_back: int = 30,
+    model: str = DEFAULT_MODEL,
+) -> dict:
+    """
+    Async version of predict_risk_full() — same arguments and return value.
+
+    The USGS and Groq calls are awaited; preprocessing runs in a worker
+    thread so the event loop stays free.
+    """
+    from earthquake_api import get_earthquakes_async
+    from earthquake_preprocessor import preprocess
+
+    raw = await get_earthquakes_async(lat=lat, lng=lng, radius_km=radius_km, min_mag=min_mag, days_back=days_back)
+    processed = await asyncio.to_thread(preprocess, raw, location_name=location_name)
+    prediction = await predict_risk_async(processed, model=model)
+
+    return {
+        "location": location_name,
+        "events_analyzed": processed["summary"].get("total_events", 0),
+        "prediction": prediction,
+        "data_summary": processed["summary"],
+    }
+
+
+async def predict_risk_many_async(regions: list[dict]) -> list[dict]:
+    """
+    Run the full fetch → preprocess → predict pipeline for several regions
+    concurrently.
+
+    Each region's stages depend on the previous one, so they stay in order;
+    running regions side by side means their USGS and Groq waits overlap,
+    and total wall time tracks the slowest region rather than the sum.
+
+    Args:
+        regions: List of keyword-argument dicts for predict_risk_full_async(),
+                 e.g. [{"lat": 37.77, "lng": -122.42, "location_name": "SF"}, ...].
+
+    Returns:
+        One predict_risk_full() result dict per region, in the same order.
+    """
+    return list(await asyncio.gather(*(predict_risk_full_async(**r) for r in regions)))
+
+
 # --------------- Self Test ---------------
 if __name__ == "__main__":
     print("=== Earthquake Risk Predictor — Self Test ===\n")
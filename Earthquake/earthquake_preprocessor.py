@@ -26,8 +26,26 @@ Usage:
 """
 
 from datetime import datetime, timezone
-from typing import Optional
-import math
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# Magnitude distribution buckets: edges are [lower, upper) except the last
+MAG_BUCKET_KEYS = ("minor_2_3", "light_3_4", "moderate_4_5", "strong_5_6", "major_6_plus")
+MAG_BUCKET_EDGES = np.array([-np.inf, 3, 4, 5, 6, np.inf])
+
+MS_PER_HOUR = 3_600_000
+MS_PER_DAY = 86_400_000
+
+
+class _EventRec(NamedTuple):
+    """Fields of one parsed event that preprocess() carries through to the output."""
+    mag: Optional[float]
+    depth_km: Optional[float]
+    lat: Optional[float]
+    lng: Optional[float]
+    place: Optional[str]
+    ms: int
 
 
 def preprocess(quakes: list[dict], location_name: str = "Unknown") -> dict:
@@ -51,19 +69,15 @@ def preprocess(quakes: list[dict], location_name: str = "Unknown") -> dict:
             "llm_prompt": f"No recent earthquake data available for {location_name}.",
         }
 
-    # --- Parse timestamps and sort by time (newest first) ---
+    # --- Single pass: timestamps as epoch ms + numeric fields (None -> NaN) ---
     parsed = []
+    numeric = []
     for q in quakes:
-        t = None
-        if q.get("time"):
-            try:
-                t = datetime.fromisoformat(q["time"])
-            except (ValueError, TypeError):
-                pass
-        parsed.append({**q, "_dt": t})
-
-    parsed = [p for p in parsed if p["_dt"] is not None]
-    parsed.sort(key=lambda x: x["_dt"], reverse=True)
+        ms = _time_ms(q)
+        if ms is not None:
+            rec = _EventRec(q["mag"], q["depth_km"], q["lat"], q["lng"], q["place"], ms)
+            parsed.append(rec)
+            numeric.append((ms, rec.mag, rec.depth_km, rec.lat, rec.lng))
 
     if not parsed:
         return {
@@ -72,33 +86,39 @@ def preprocess(quakes: list[dict], location_name: str = "Unknown") -> dict:
             "llm_prompt": f"No valid earthquake data for {location_name}.",
         }
 
+    cols = np.array(numeric, dtype=np.float64).T
+    times = cols[0].astype(np.int64)
+    mags, depths, lats, lngs = (_valid(c) for c in cols[1:])
+
+    # Sort by time (newest first). USGS is queried with orderby=time, so input
+    # is normally already in order; an O(N) check skips the sort in that case.
+    if not (times[:-1] >= times[1:]).all():
+        order = np.argsort(-times, kind="stable")
+        times = times[order]
+        parsed = [parsed[i] for i in order]
+
     # --- Basic stats ---
-    mags = [p["mag"] for p in parsed if p["mag"] is not None]
-    depths = [p["depth_km"] for p in parsed if p["depth_km"] is not None]
-    lats = [p["lat"] for p in parsed if p["lat"] is not None]
-    lngs = [p["lng"] for p in parsed if p["lng"] is not None]
-
-    mag_avg = round(sum(mags) / len(mags), 2) if mags else None
-    mag_max = round(max(mags), 2) if mags else None
-    mag_min = round(min(mags), 2) if mags else None
-    depth_avg = round(sum(depths) / len(depths), 2) if depths else None
-    depth_min = round(min(depths), 2) if depths else None
-    depth_max = round(max(depths), 2) if depths else None
+    mag_avg = round(float(mags.mean()), 2) if mags.size else None
+    mag_max = round(float(mags.max()), 2) if mags.size else None
+    mag_min = round(float(mags.min()), 2) if mags.size else None
+    depth_avg = round(float(depths.mean()), 2) if depths.size else None
+    depth_min = round(float(depths.min()), 2) if depths.size else None
+    depth_max = round(float(depths.max()), 2) if depths.size else None
 
     # --- Time span & frequency ---
-    newest = parsed[0]["_dt"]
-    oldest = parsed[-1]["_dt"]
-    span_days = max((newest - oldest).total_seconds() / 86400, 0.01)
+    newest = int(times[0])
+    oldest = int(times[-1])
+    span_days = max((newest - oldest) / MS_PER_DAY, 0.01)
     events_per_day = round(len(parsed) / span_days, 2)
 
     # --- Temporal acceleration ---
     # Compare event frequency in first half vs second half of the time window
     midpoint = oldest + (newest - oldest) / 2
-    first_half = [p for p in parsed if p["_dt"] <= midpoint]
-    second_half = [p for p in parsed if p["_dt"] > midpoint]
+    n_recent = int(np.count_nonzero(times > midpoint))
+    n_early = len(times) - n_recent
     half_days = max(span_days / 2, 0.01)
-    freq_early = len(first_half) / half_days
-    freq_recent = len(second_half) / half_days
+    freq_early = n_early / half_days
+    freq_recent = n_recent / half_days
 
     if freq_early > 0:
         accel_ratio = round(freq_recent / freq_early, 2)
@@ -116,32 +136,17 @@ def preprocess(quakes: list[dict], location_name: str = "Unknown") -> dict:
         trend = "unknown"
 
     # --- Time gaps between consecutive events ---
-    gaps_hours = []
-    for i in range(len(parsed) - 1):
-        gap = (parsed[i]["_dt"] - parsed[i + 1]["_dt"]).total_seconds() / 3600
-        gaps_hours.append(round(gap, 1))
-    avg_gap_hours = round(sum(gaps_hours) / len(gaps_hours), 1) if gaps_hours else None
-    min_gap_hours = min(gaps_hours) if gaps_hours else None
+    gaps_hours = np.round(-np.diff(times) / MS_PER_HOUR, 1)
+    avg_gap_hours = round(float(gaps_hours.mean()), 1) if gaps_hours.size else None
+    min_gap_hours = float(gaps_hours.min()) if gaps_hours.size else None
 
     # --- Magnitude distribution buckets ---
-    buckets = {"minor_2_3": 0, "light_3_4": 0, "moderate_4_5": 0, "strong_5_6": 0, "major_6_plus": 0}
-    for m in mags:
-        if m < 3:
-            buckets["minor_2_3"] += 1
-        elif m < 4:
-            buckets["light_3_4"] += 1
-        elif m < 5:
-            buckets["moderate_4_5"] += 1
-        elif m < 6:
-            buckets["strong_5_6"] += 1
-        else:
-            buckets["major_6_plus"] += 1
+    counts, _ = np.histogram(mags, bins=MAG_BUCKET_EDGES)
+    buckets = dict(zip(MAG_BUCKET_KEYS, counts.tolist()))
 
     # --- Geographic spread (simple std dev of coords) ---
-    lat_center = round(sum(lats) / len(lats), 4) if lats else None
-    lng_center = round(sum(lngs) / len(lngs), 4) if lngs else None
-    lat_spread = round(_std(lats), 4) if len(lats) > 1 else 0
-    lng_spread = round(_std(lngs), 4) if len(lngs) > 1 else 0
+    lat_center, lat_spread = _center_spread(lats)
+    lng_center, lng_spread = _center_spread(lngs)
     is_clustered = lat_spread < 0.5 and lng_spread < 0.5
 
     # --- Build summary dict ---
@@ -175,15 +180,18 @@ def preprocess(quakes: list[dict], location_name: str = "Unknown") -> dict:
     }
 
     # --- Condensed event list ---
+    # Timestamps are formatted for the whole column at once ("YYYY-MM-DDTHH:MM")
+    # instead of a datetime + strftime round-trip per event.
+    stamps = np.datetime_as_string(times.astype("datetime64[ms]"), unit="m").tolist()
     events = []
-    for p in parsed:
+    for p, stamp in zip(parsed, stamps):
         events.append({
-            "mag": p["mag"],
-            "depth_km": round(p["depth_km"], 1) if p["depth_km"] else None,
-            "lat": round(p["lat"], 3) if p["lat"] else None,
-            "lng": round(p["lng"], 3) if p["lng"] else None,
-            "time": p["_dt"].strftime("%Y-%m-%d %H:%M UTC"),
-            "place": p["place"],
+            "mag": p.mag,
+            "depth_km": round(p.depth_km, 1) if p.depth_km else None,
+            "lat": round(p.lat, 3) if p.lat else None,
+            "lng": round(p.lng, 3) if p.lng else None,
+            "time": f"{stamp[:10]} {stamp[11:]} UTC",
+            "place": p.place,
         })
 
     # --- LLM-ready prompt ---
@@ -244,14 +252,41 @@ def _build_prompt(summary: dict, events: list) -> str:
     return "\n".join(lines)
 
 
-def _std(values: list[float]) -> float:
-    """Simple standard deviation."""
-    n = len(values)
-    if n < 2:
+def _time_ms(quake: dict) -> Optional[int]:
+    """Event time as epoch milliseconds (UTC), or None if missing/invalid."""
+    ms = quake.get("time_ms")
+    if ms is not None:
+        return int(ms)
+    if not quake.get("time"):
+        return None
+    try:
+        dt = datetime.fromisoformat(quake["time"])
+    except (ValueError, TypeError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return round(dt.timestamp() * 1000)
+
+
+def _valid(values: np.ndarray) -> np.ndarray:
+    """Drop missing (NaN) entries from a numeric column."""
+    return values[~np.isnan(values)]
+
+
+def _center_spread(values: np.ndarray) -> tuple[Optional[float], float]:
+    """Mean and sample std dev of a coordinate column, rounded to 4 dp."""
+    if not values.size:
+        return None, 0
+    center = round(float(values.mean()), 4)
+    spread = round(_std(values), 4) if values.size > 1 else 0
+    return center, spread
+
+
+def _std(values) -> float:
+    """Sample standard deviation (ddof=1), computed by NumPy in float64."""
+    if len(values) < 2:
         return 0.0
-    mean = sum(values) / n
-    variance = sum((x - mean) ** 2 for x in values) / (n - 1)
-    return math.sqrt(variance)
+    return float(np.std(np.asarray(values, dtype=np.float64), ddof=1))
 
 
 # --------------- Self Test ---------------
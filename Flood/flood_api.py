@@ -10,17 +10,62 @@ No API key required. Free and open access.
 API Docs: https://open-meteo.com/en/docs/flood-api
 
 Usage:
-    from flood_api import get_flood_data
+    from flood_api import get_flood_data, get_flood_data_many
 
     data = get_flood_data(lat=29.76, lng=-95.36)  # Houston, TX
+
+    # Several locations at once (requests run concurrently)
+    houston, nola = get_flood_data_many([(29.76, -95.36), (29.95, -90.07)])
 """
 
+import asyncio
+import bisect
+import contextlib
+import math
+import time
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 BASE_URL = "https://flood-api.open-meteo.com/v1/flood"
 
+# In-process response cache: GloFAS discharge for a grid cell updates at most
+# daily, so repeat queries within a few hours reuse the previous result
+CACHE_TTL_SECONDS = 6 * 3600
+CACHE_MAX_ENTRIES = 256
+_cache: dict[tuple, tuple[float, dict]] = {}
+
+# GloFAS v4 grid resolution in degrees. Every query inside one grid cell gets
+# the same cell's data back, so cache keys use the cell index, not raw coords.
+GRID_DEG = 0.05
+
+# Comma-joined "daily" query values, without and with the ensemble stats
+_DAILY_VARS_BASIC = "river_discharge"
+_DAILY_VARS_WITH_STATS = ",".join([
+    "river_discharge",
+    "river_discharge_mean",
+    "river_discharge_median",
+    "river_discharge_max",
+    "river_discharge_min",
+    "river_discharge_p25",
+    "river_discharge_p75",
+])
+
+# Shared requests session: pooled keep-alive connections to Open-Meteo (no
+# TCP/TLS handshake per call), retrying connect errors and transient 429/5xx
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
+# Shared aiohttp session for the async API, bound to the loop that created it
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
 
 def get_flood_data(
     lat: float,
@@ -50,29 +95,186 @@ def get_flood_data(
             metadata     (dict) : Units and generation time
             error        (str|None) : Error message if request failed
 
+        Successful results are cached for CACHE_TTL_SECONDS per (rounded)
+        location, date window and UTC day. If a request fails, the last
+        cached result for the same query is returned instead, when there is one.
+
     Raises:
         ValueError: If lat/lng are out of valid range.
     """
+    params = _build_params(lat, lng, past_days, forecast_days, start_date, end_date, include_stats)
+    key = _cache_key(params)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        resp = _http.get(BASE_URL, params=params, timeout=15)
+        resp.raise_for_status()
+        data = resp.json()
+    except requests.RequestException as e:
+        return _cache_get(key, allow_stale=True) or _error(f"Request failed: {e}")
+    except ValueError:
+        return _cache_get(key, allow_stale=True) or _error("Failed to parse JSON")
+
+    return _cache_put(key, _parse_response(data, include_stats))
+
+
+async def get_flood_data_async(
+    lat: float,
+    lng: float,
+    past_days: int = 30,
+    forecast_days: int = 30,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    include_stats: bool = True,
+) -> dict:
+    """
+    Async version of get_flood_data() — same arguments and return value.
+
+    Uses a shared aiohttp session so the calling event loop is never blocked
+    and several locations can be fetched concurrently.
+    """
+    params = _build_params(lat, lng, past_days, forecast_days, start_date, end_date, include_stats)
+    key = _cache_key(params)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        session = await _get_session()
+        async with session.get(
+            BASE_URL, params=params, timeout=aiohttp.ClientTimeout(total=15)
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return _cache_get(key, allow_stale=True) or _error(f"Request failed: {e}")
+    except ValueError:
+        return _cache_get(key, allow_stale=True) or _error("Failed to parse JSON")
+
+    return _cache_put(key, _parse_response(data, include_stats))
+
+
+def get_flood_data_many(
+    coords: list[tuple[float, float]],
+    max_concurrency: int = 16,
+    **kwargs,
+) -> list[dict]:
+    """
+    Fetch flood data for several locations concurrently.
+
+    Args:
+        coords:          List of (lat, lng) pairs.
+        max_concurrency: Maximum number of requests in flight at once.
+        **kwargs:        Extra arguments for get_flood_data() (past_days, ...).
+
+    Returns:
+        One get_flood_data() result dict per location, in the same order.
+        A failed location yields a dict with "error" set, as with get_flood_data().
+
+    Raises:
+        ValueError: If any lat/lng is out of valid range.
+    """
+    return asyncio.run(_gather(coords, max_concurrency, kwargs))
+
+
+async def close_session():
+    """Close the shared aiohttp session (call on application shutdown)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def _gather(coords: list[tuple[float, float]], max_concurrency: int, kwargs: dict) -> list[dict]:
+    """Run get_flood_data_async() for every location, at most max_concurrency at a time."""
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def one(lat: float, lng: float) -> dict:
+        async with sem:
+            return await get_flood_data_async(lat, lng, **kwargs)
+
+    try:
+        return list(await asyncio.gather(*(one(lat, lng) for lat, lng in coords)))
+    finally:
+        await close_session()
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session, (re)creating it on the running loop.
+    A session still open from an earlier loop is closed once replaced.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        # Swap before awaiting, so concurrent callers share the new session.
+        # Keep idle connections and resolved DNS around longer than aiohttp's
+        # defaults (15 s / 10 s), so repeat fetches skip DNS, TCP and TLS
+        old = _session
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(ttl_dns_cache=300, keepalive_timeout=60)
+        )
+        _session_loop = loop
+        if old is not None and not old.closed:
+            with contextlib.suppress(RuntimeError):  # its loop may be closed already
+                await old.close()
+    return _session
+
+
+def _cache_key(params: dict) -> tuple:
+    """Cache key for a query: the GloFAS grid cell containing the coordinates,
+    plus the UTC day (past_days/forecast_days windows are relative to today)."""
+    key = dict(
+        params,
+        latitude=math.floor(params["latitude"] / GRID_DEG),
+        longitude=math.floor(params["longitude"] / GRID_DEG),
+    )
+    return (datetime.now(timezone.utc).date(), *sorted(key.items()))
+
+
+def _cache_get(key: tuple, allow_stale: bool = False) -> Optional[dict]:
+    """Return a copy of the cached result for key, or None if missing/expired."""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    fetched_at, result = entry
+    if not allow_stale and time.monotonic() - fetched_at > CACHE_TTL_SECONDS:
+        return None
+    return dict(result)
+
+
+def _cache_put(key: tuple, result: dict) -> dict:
+    """Store a successful result (evicting the oldest entry if full) and return it."""
+    if result["error"] is not None:
+        return result
+    _cache.pop(key, None)
+    _cache[key] = (time.monotonic(), result)
+    if len(_cache) > CACHE_MAX_ENTRIES:
+        del _cache[next(iter(_cache))]
+    return dict(result)
+
+
+def _build_params(
+    lat: float,
+    lng: float,
+    past_days: int,
+    forecast_days: int,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    include_stats: bool,
+) -> dict:
+    """Validate the location and build Open-Meteo query parameters."""
     if not (-90 <= lat <= 90):
         raise ValueError(f"Latitude must be between -90 and 90, got {lat}")
     if not (-180 <= lng <= 180):
         raise ValueError(f"Longitude must be between -180 and 180, got {lng}")
 
-    daily_vars = ["river_discharge"]
-    if include_stats:
-        daily_vars.extend([
-            "river_discharge_mean",
-            "river_discharge_median",
-            "river_discharge_max",
-            "river_discharge_min",
-            "river_discharge_p25",
-            "river_discharge_p75",
-        ])
-
     params = {
         "latitude": lat,
         "longitude": lng,
-        "daily": ",".join(daily_vars),
+        "daily": _DAILY_VARS_WITH_STATS if include_stats else _DAILY_VARS_BASIC,
         "timeformat": "iso8601",
     }
 
@@ -83,29 +285,32 @@ def get_flood_data(
         params["past_days"] = past_days
         params["forecast_days"] = forecast_days
 
-    try:
-        resp = requests.get(BASE_URL, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
-        return {"error": f"Request failed: {e}", "daily": [], "location": {}, "metadata": {}}
-    except ValueError:
-        return {"error": "Failed to parse JSON", "daily": [], "location": {}, "metadata": {}}
+    return params
+
 
+def _error(message: str) -> dict:
+    """Empty result carrying an error message."""
+    return {"error": message, "daily": [], "location": {}, "metadata": {}}
+
+
+def _parse_response(data: dict, include_stats: bool) -> dict:
+    """Turn an Open-Meteo flood response into the get_flood_data() result dict."""
     if data.get("error"):
-        return {"error": data.get("reason", "Unknown API error"), "daily": [], "location": {}, "metadata": {}}
+        return _error(data.get("reason", "Unknown API error"))
 
     # Parse daily data into list of dicts
     raw_daily = data.get("daily", {})
     times = raw_daily.get("time", [])
 
-    daily = []
+    # Dates come back sorted, so everything after today starts at one index
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    forecast_start = bisect.bisect_right(times, today)
 
+    daily = []
     for i, date in enumerate(times):
         entry = {
             "date": date,
-            "is_forecast": date > today,
+            "is_forecast": i >= forecast_start,
             "discharge_m3s": _safe_get(raw_daily, "river_discharge", i),
         }
         if include_stats:
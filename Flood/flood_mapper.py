@@ -10,7 +10,8 @@ Outputs to Data/flood_coordinates.json
 
 import os
 import sys
-import json
+
+import orjson
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
@@ -90,8 +91,8 @@ def generate_map(summary: dict) -> dict:
 
     # Load existing map to accumulate multiple locations
     if os.path.exists(OUTPUT_FILE):
-        with open(OUTPUT_FILE, "r") as f:
-            coord_map = json.load(f)
+        with open(OUTPUT_FILE, "rb") as f:
+            coord_map = orjson.loads(f.read())
     else:
         coord_map = {}
 
@@ -99,8 +100,12 @@ def generate_map(summary: dict) -> dict:
         key = f"{round(lat, 4)},{round(lng, 4)}"
         coord_map[key] = discharge_to_risk(summary)
 
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(coord_map, f, indent=2)
+    # Compact orjson bytes, written to a temp file and swapped in atomically so
+    # the globe never fetches a half-written map
+    tmp_file = f"{OUTPUT_FILE}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(coord_map))
+    os.replace(tmp_file, OUTPUT_FILE)
 
     print(f"[flood_mapper] Saved {len(coord_map)} coordinates → {OUTPUT_FILE}")
     return coord_map
\ No newline at end of file
@@ -14,17 +14,31 @@ Usage:
 """
 
 import os
+import re
 import sys
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
+from llm_cache import cache_key, load_cached, save_cached
+
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 DEFAULT_MODEL = "llama-3.3-70b-versatile"
 
+# JSON object inside a ```json (or bare ```) markdown fence in the LLM reply.
+# The closing fence may be missing when a streamed reply was cut at the "}".
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*(?:```|\Z)", re.S)
+
+# Shared requests session: pooled keep-alive connections to Groq (no TCP/TLS
+# handshake per call) and two quick retries on connect errors
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2)))
+
 SYSTEM_PROMPT = """You are a hydrology and flood risk assessment AI. You analyze river discharge data and provide structured flood risk assessments.
 
 Given river discharge data for a region, you MUST respond ONLY in this exact JSON format, no extra text:
@@ -48,13 +62,18 @@ Assessment criteria:
 Consider: current discharge vs historical baseline, 7-day trend direction and speed, forecast max projections, spike frequency, and risk days when making your assessment."""
 
 
-def predict_flood_risk(processed: dict, model: str = DEFAULT_MODEL) -> dict:
+def predict_flood_risk(processed: dict, model: str = DEFAULT_MODEL, stream: bool = False) -> dict:
     """
     Send preprocessed flood data to Groq LLM for risk assessment.
 
+    Successful responses are cached on disk by request content (see
+    llm_cache), so an identical prompt within 30 minutes skips the API call.
+
     Args:
         processed: Output from flood_preprocessor.preprocess().
         model:     Groq model to use.
+        stream:    Stream the completion and stop reading as soon as the
+                   JSON object in the reply is complete.
 
     Returns:
         Dict with risk_level, risk_score, confidence, summary,
@@ -87,23 +106,29 @@ def predict_flood_risk(processed: dict, model: str = DEFAULT_MODEL) -> dict:
         "max_tokens": 500,
     }
 
+    key = cache_key(payload)
+    cached = load_cached(key)
+    if cached is not None:
+        return cached
+
     try:
-        resp = requests.post(GROQ_API_URL, headers=headers, json=payload, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
+        if stream:
+            raw_text = _stream_completion(headers, payload)
+        else:
+            resp = _http.post(GROQ_API_URL, headers=headers, json=payload, timeout=30)
+            resp.raise_for_status()
+            raw_text = orjson.loads(resp.content)["choices"][0]["message"]["content"]
     except requests.RequestException as e:
         return {"error": f"Groq API request failed: {e}", "risk_level": "UNKNOWN"}
+    except orjson.JSONDecodeError:
+        return {"error": "Groq API returned invalid JSON", "risk_level": "UNKNOWN"}
 
-    raw_text = data["choices"][0]["message"]["content"].strip()
+    raw_text = raw_text.strip()
 
+    m = _FENCE_RE.search(raw_text)
     try:
-        cleaned = raw_text
-        if "```" in cleaned:
-            cleaned = cleaned.split("```json")[-1].split("```")[0].strip()
-            if not cleaned:
-                cleaned = raw_text.split("```")[-2].strip()
-        result = json.loads(cleaned)
-    except (json.JSONDecodeError, IndexError):
+        result = orjson.loads(m.group(1) if m else raw_text)
+    except orjson.JSONDecodeError:
         return {
             "error": "Failed to parse LLM response as JSON",
             "risk_level": "UNKNOWN",
@@ -114,9 +139,53 @@ def predict_flood_risk(processed: dict, model: str = DEFAULT_MODEL) -> dict:
     result["raw_response"] = raw_text
     result["model"] = model
     result["error"] = None
+    save_cached(key, result)
     return result
 
 
+def _stream_completion(headers: dict, payload: dict) -> str:
+    """
+    POST a streaming chat completion and join the content deltas.
+
+    Braces are tracked (outside JSON strings) as tokens arrive; once the first
+    top-level object closes, the connection is dropped and the reply is cut
+    there, instead of waiting for the model to finish any trailing text.
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+    with _http.post(
+        GROQ_API_URL, headers=headers, json={**payload, "stream": True}, timeout=30, stream=True
+    ) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            if not line.startswith(b"data: "):
+                continue
+            frame = line[6:]
+            if frame == b"[DONE]":
+                break
+            delta = orjson.loads(frame)["choices"][0]["delta"].get("content") or ""
+            for i, ch in enumerate(delta):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == "{":
+                    depth += 1
+                elif depth and ch == '"':
+                    in_string = True
+                elif depth and ch == "}":
+                    depth -= 1
+                    if not depth:
+                        parts.append(delta[: i + 1])
+                        return "".join(parts)
+            parts.append(delta)
+    return "".join(parts)
+
+
 def predict_flood_risk_full(
     lat: float,
     lng: float,
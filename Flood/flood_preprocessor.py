@@ -20,9 +20,13 @@ Usage:
     print(result["llm_prompt"])
 """
 
-import math
 from typing import Optional
 
+import numpy as np
+
+SPIKE_PCT = 30             # day-over-day change (%) counted as a spike
+FORECAST_RISK_RATIO = 1.2  # forecast max above this multiple of the historical peak
+
 
 def preprocess(flood_data: dict, location_name: str = "Unknown") -> dict:
     """
@@ -46,47 +50,78 @@ def preprocess(flood_data: dict, location_name: str = "Unknown") -> dict:
         }
 
     daily = flood_data["daily"]
-    historical = [d for d in daily if not d["is_forecast"]]
-    forecast = [d for d in daily if d["is_forecast"]]
+
+    # Days are in date order, so the forecast days form a single tail: find
+    # where it starts and slice instead of filtering every day twice
+    split = next((i for i, d in enumerate(daily) if d["is_forecast"]), len(daily))
+    historical = daily[:split]
+    forecast = daily[split:]
+
+    # --- One pass over each part: collect values, condense events ---
+    hist_vals = []
+    hist_events = []
+    for d in historical:
+        disch = d["discharge_m3s"]
+        if disch is not None:
+            hist_vals.append(disch)
+        hist_events.append({"date": d["date"], "type": "historical", "discharge": disch})
+
+    fcast_mean_vals = []
+    fcast_max_vals = []
+    fcast_events = []
+    for d in forecast:
+        fmean = d.get("mean")
+        fmax = d.get("max")
+        fcast_mean_vals.append(fmean)
+        fcast_max_vals.append(fmax)
+        fcast_events.append({
+            "date": d["date"],
+            "type": "forecast",
+            "discharge": d["discharge_m3s"],
+            "mean": fmean,
+            "max": fmax,
+            "min": d.get("min"),
+        })
+    events = hist_events + fcast_events
 
     # --- Historical analysis ---
-    hist_vals = [d["discharge_m3s"] for d in historical if d["discharge_m3s"] is not None]
-    hist_stats = _calc_stats(hist_vals, "historical")
+    hist = np.array(hist_vals, dtype=np.float64)
+    hist_stats = _calc_stats(hist, "historical")
 
-    # --- Forecast analysis ---
-    fcast_means = [d.get("mean") for d in forecast if d.get("mean") is not None]
-    fcast_maxes = [d.get("max") for d in forecast if d.get("max") is not None]
-    fcast_stats = _calc_stats(fcast_means, "forecast_mean")
-    fcast_max_stats = _calc_stats(fcast_maxes, "forecast_max")
+    # --- Forecast analysis (None -> NaN, dropped before the stats) ---
+    fcast_means = np.array(fcast_mean_vals, dtype=np.float64)
+    fcast_maxes = np.array(fcast_max_vals, dtype=np.float64)
+    fcast_stats = _calc_stats(_valid(fcast_means), "forecast_mean")
+    fcast_max_stats = _calc_stats(_valid(fcast_maxes), "forecast_max")
 
     # --- Trend detection (last 7 days of historical) ---
-    recent_7 = hist_vals[-7:] if len(hist_vals) >= 7 else hist_vals
-    trend = _detect_trend(recent_7)
+    trend = _detect_trend(hist[-7:])
 
     # --- Spike detection (day-over-day changes) ---
-    spikes = []
-    for i in range(1, len(hist_vals)):
-        prev = hist_vals[i - 1]
-        curr = hist_vals[i]
-        if prev and prev > 0:
-            pct_change = ((curr - prev) / prev) * 100
-            if abs(pct_change) > 30:
-                spikes.append({
-                    "date": historical[i]["date"],
-                    "from": prev,
-                    "to": curr,
-                    "pct_change": round(pct_change, 1),
-                })
+    prev = hist[:-1]
+    curr = hist[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = (curr - prev) / prev * 100
+    spike_idx = np.flatnonzero((prev > 0) & (np.abs(pct) > SPIKE_PCT))
+    spikes = [
+        {
+            "date": historical[i + 1]["date"],
+            "from": hist_vals[i],
+            "to": hist_vals[i + 1],
+            "pct_change": round(float(pct[i]), 1),
+        }
+        for i in spike_idx.tolist()
+    ]
 
     # --- Forecast risk: check if max projections exceed historical peaks ---
-    hist_peak = max(hist_vals) if hist_vals else 0
-    hist_avg = sum(hist_vals) / len(hist_vals) if hist_vals else 0
+    hist_peak = float(hist.max()) if hist.size else 0
     forecast_risk_days = []
-    for d in forecast:
-        fmax = d.get("max")
-        if fmax and hist_peak > 0 and fmax > hist_peak * 1.2:
+    if hist_peak > 0:
+        risk_idx = np.flatnonzero(fcast_maxes > hist_peak * FORECAST_RISK_RATIO)
+        for i in risk_idx.tolist():
+            fmax = float(fcast_maxes[i])
             forecast_risk_days.append({
-                "date": d["date"],
+                "date": forecast[i]["date"],
                 "projected_max": round(fmax, 2),
                 "vs_hist_peak_pct": round(((fmax - hist_peak) / hist_peak) * 100, 1),
             })
@@ -112,22 +147,8 @@ def preprocess(flood_data: dict, location_name: str = "Unknown") -> dict:
         "forecast_risks": forecast_risk_days[:5],
     }
 
-    # --- Condensed events ---
-    events = []
-    for d in daily:
-        entry = {
-            "date": d["date"],
-            "type": "forecast" if d["is_forecast"] else "historical",
-            "discharge": d["discharge_m3s"],
-        }
-        if d["is_forecast"]:
-            entry["mean"] = d.get("mean")
-            entry["max"] = d.get("max")
-            entry["min"] = d.get("min")
-        events.append(entry)
-
     # --- LLM prompt ---
-    llm_prompt = _build_prompt(summary, events)
+    llm_prompt = _build_prompt(summary, hist_events[-10:], fcast_events[:10])
 
     # Generate coordinate → risk map
     from flood_mapper import generate_map
@@ -141,32 +162,26 @@ def preprocess(flood_data: dict, location_name: str = "Unknown") -> dict:
     }
 
 
-def _calc_stats(values: list, label: str) -> dict:
-    """Calculate basic stats for a list of values."""
-    if not values:
+def _calc_stats(values: np.ndarray, label: str) -> dict:
+    """Calculate basic stats for an array of values."""
+    if not values.size:
         return {"min": None, "max": None, "avg": None, "std": None}
-    avg = round(sum(values) / len(values), 2)
     return {
-        "min": round(min(values), 2),
-        "max": round(max(values), 2),
-        "avg": avg,
+        "min": round(float(values.min()), 2),
+        "max": round(float(values.max()), 2),
+        "avg": round(float(values.mean()), 2),
         "std": round(_std(values), 2),
     }
 
 
-def _detect_trend(values: list) -> dict:
-    """Simple linear trend detection."""
+def _detect_trend(values: np.ndarray) -> dict:
+    """Simple linear trend detection (least-squares slope)."""
     if len(values) < 3:
         return {"direction": "insufficient_data", "slope": 0}
 
-    n = len(values)
-    x_mean = (n - 1) / 2
-    y_mean = sum(values) / n
-
-    numerator = sum((i - x_mean) * (v - y_mean) for i, v in enumerate(values))
-    denominator = sum((i - x_mean) ** 2 for i in range(n))
-
-    slope = numerator / denominator if denominator != 0 else 0
+    x = np.arange(len(values)) - (len(values) - 1) / 2
+    y_mean = float(values.mean())
+    slope = float(x @ (values - y_mean) / (x @ x))
 
     if y_mean > 0:
         pct_per_day = (slope / y_mean) * 100
@@ -191,8 +206,13 @@ def _detect_trend(values: list) -> dict:
     }
 
 
-def _build_prompt(summary: dict, events: list) -> str:
-    """Build a concise prompt string for LLM flood risk assessment."""
+def _build_prompt(summary: dict, hist_events: list, fcast_events: list) -> str:
+    """
+    Build a concise prompt string for LLM flood risk assessment.
+
+    hist_events/fcast_events are the recent historical and upcoming forecast
+    events to list (preprocess passes the last and first 10 respectively).
+    """
     s = summary
     h = s["historical"]
     f = s["forecast"]
@@ -215,42 +235,46 @@ def _build_prompt(summary: dict, events: list) -> str:
         f"SPIKES DETECTED: {s['spikes_detected']}",
     ]
 
-    for sp in s.get("spikes", []):
-        lines.append(f"  {sp['date']}: {sp['from']} → {sp['to']} m³/s ({sp['pct_change']}% change)")
+    lines.extend(
+        f"  {sp['date']}: {sp['from']} → {sp['to']} m³/s ({sp['pct_change']}% change)"
+        for sp in s.get("spikes", [])
+    )
 
     lines.append(f"\nFORECAST RISK DAYS (projected max > 120% of historical peak): {s['forecast_risk_days']}")
-    for r in s.get("forecast_risks", []):
-        lines.append(f"  {r['date']}: projected max={r['projected_max']} m³/s ({r['vs_hist_peak_pct']}% above peak)")
+    lines.extend(
+        f"  {r['date']}: projected max={r['projected_max']} m³/s ({r['vs_hist_peak_pct']}% above peak)"
+        for r in s.get("forecast_risks", [])
+    )
 
     # Add recent historical data
-    hist_events = [e for e in events if e["type"] == "historical"]
-    fcast_events = [e for e in events if e["type"] == "forecast"]
-
     lines.append(f"\nRECENT DISCHARGE (last 10 days):")
-    for e in hist_events[-10:]:
-        lines.append(f"  {e['date']} | {e['discharge']} m³/s")
+    lines.extend(f"  {e['date']} | {e['discharge']} m³/s" for e in hist_events)
 
     lines.append(f"\nFORECAST (next 10 days):")
-    for e in fcast_events[:10]:
-        lines.append(f"  {e['date']} | mean={e.get('mean')} max={e.get('max')} min={e.get('min')} m³/s")
+    lines.extend(
+        f"  {e['date']} | mean={e.get('mean')} max={e.get('max')} min={e.get('min')} m³/s"
+        for e in fcast_events
+    )
 
-    lines.append("")
-    lines.append(
+    lines += [
+        "",
         "Based on the river discharge patterns above (historical levels, 7-day trend, "
-        "forecast projections, spike history, and risk days), assess the flood risk for this region."
-    )
+        "forecast projections, spike history, and risk days), assess the flood risk for this region.",
+    ]
 
     return "\n".join(lines)
 
 
-def _std(values: list[float]) -> float:
-    """Simple standard deviation."""
-    n = len(values)
-    if n < 2:
+def _valid(values: np.ndarray) -> np.ndarray:
+    """Drop missing (NaN) entries from a numeric column."""
+    return values[~np.isnan(values)]
+
+
+def _std(values: np.ndarray) -> float:
+    """Sample standard deviation (ddof=1)."""
+    if len(values) < 2:
         return 0.0
-    mean = sum(values) / n
-    variance = sum((x - mean) ** 2 for x in values) / (n - 1)
-    return math.sqrt(variance)
+    return float(values.std(ddof=1))
 
 
 # --------------- Self Test ---------------
@@ -1,28 +1,56 @@
+import csv
 import requests
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import os
 from dotenv import load_dotenv
 
+# Shared session: FIRMS connections stay pooled (keep-alive) across calls
+_http = requests.Session()
+
+
+def _coerce(value):
+    """Parse a FIRMS CSV cell as int or float where possible (empty -> None)."""
+    if value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
 def Fire_API(lat,long):
     load_dotenv()
     MAP_KEY = os.getenv("MAP_KEY", "demo").strip()
     print(MAP_KEY)
 
-    # Check transaction status
+    # Check transaction status (in the background: it is independent of the
+    # area query, so both requests are in flight at once)
     status_url = f'https://firms.modaps.eosdis.nasa.gov/mapserver/mapkey_status/?MAP_KEY={MAP_KEY}'
-    status_resp = requests.get(status_url).json()
-    print('Transactions used:', status_resp.get('current_transactions', 'Error'))
 
     # Fetch VIIRS NRT fires in California (bbox: minlon,minlat,maxlon,maxlat), last 1 day
     # US example: California ~ -125,32,-114,42
     area_url = f'https://firms.modaps.eosdis.nasa.gov/api/area/csv/{MAP_KEY}/VIIRS_SNPP_NRT/{lat},{long}/1'
-    df = pd.read_csv(area_url)
 
-    # Convert to JSON and save
-    data_json = df.to_json(orient='records', lines=True, date_format='iso')
-    with open('../Data/us_fires.json', 'w') as f:
-        f.write(data_json)
-    print(f'Saved {len(df)} fire detections to us_fires.json')
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        status = pool.submit(lambda: _http.get(status_url).json())
+
+        # Parse the CSV rows as they stream in instead of loading a DataFrame
+        with _http.get(area_url, stream=True) as resp:
+            resp.raise_for_status()
+            resp.encoding = 'utf-8'
+            reader = csv.DictReader(resp.iter_lines(decode_unicode=True))
+            records = [{k: _coerce(v) for k, v in row.items()} for row in reader]
+
+    print('Transactions used:', status.result().get('current_transactions', 'Error'))
+
+    # Save as a JSON array
+    with open('../Data/us_fires.json', 'wb') as f:
+        f.write(orjson.dumps(records))
+    print(f'Saved {len(records)} fire detections to us_fires.json')
 
 if __name__ == '__main__':
     lat,long = "-125,32","-114,42"
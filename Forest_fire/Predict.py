@@ -1,20 +1,20 @@
-import json
-import pandas as pd
+import orjson
 # from collections import defaultdict
 # import io
 import re  # For LLM output parsing
 from model import *
 def Predict_forest_fires():
-    df = pd.read_json('../Data/us_fires.json', lines=True)
+    with open('../Data/us_fires.json', 'rb') as f:
+        records = orjson.loads(f.read())
 
     # 1. Key fields JSON
-    key_data = df[['latitude', 'longitude', 'bright_ti4', 'frp', 'confidence', 'acq_date']].round(4).to_dict('records')
-    with open('../Data/fire_key.json', 'w') as f:
-        json.dump(key_data, f, indent=2)
+    key_data = [{k: round4(r[k]) for k in KEY_COLS} for r in records]
+    with open('../Data/fire_key.json', 'wb') as f:
+        f.write(orjson.dumps(key_data, option=orjson.OPT_INDENT_2))
 
     # 2. map.json: lat,lon -> prediction (default low; update with LLM)
-    coords = df[['latitude', 'longitude']].round(4).drop_duplicates()
-    map_data = {f"{row.latitude},{row.longitude}": "Low" for _, row in coords.iterrows()}
+    # (dict keys dedupe the coordinates and keep first-seen order)
+    map_data = {f"{r['latitude']},{r['longitude']}": "Low" for r in key_data}
 
 
 if __name__ == '__main__':
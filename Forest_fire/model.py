@@ -1,9 +1,11 @@
 # #!/usr/bin/env python3
-import json
-import pandas as pd
+import hashlib
+import orjson
+import numpy as np
 from groq import Groq
 from dotenv import load_dotenv
 import os
+import sys
 
 
 from pathlib import Path
@@ -11,6 +13,28 @@ from pathlib import Path
 HERE = Path(__file__).resolve().parent
 DATA_DIR = HERE.parent / "Data"  # Forest_fire/.. / Data  == PROJECT_ROOT/Data
 
+sys.path.append(str(HERE.parent))
+from llm_cache import cache_key, load_cached, save_cached
+
+# FIRMS data refreshes about twice a day, so a summary stays good for 6h
+SUMMARY_CACHE_TTL_SECONDS = 6 * 3600
+
+KEY_COLS = ('latitude', 'longitude', 'bright_ti4', 'frp', 'confidence', 'acq_date')
+
+# Above this many detections the prompt gets DBSCAN cluster summaries instead
+# of one row per fire (token cost stays O(clusters) rather than O(fires))
+CLUSTER_MIN_ROWS = 200
+CLUSTER_EPS_KM = 5.0
+CLUSTER_MIN_SAMPLES = 3
+EARTH_RADIUS_KM = 6371.0
+
+
+
+def round4(value):
+    """Round floats to 4 dp the way DataFrame.round(4) does (scale, round half
+    to even, unscale); leave other values as is."""
+    return round(value * 10_000) / 10_000 if isinstance(value, float) else value
+
 
 load_dotenv()
 client = Groq(api_key=os.getenv("GROQ_API_KEY_3"))
@@ -21,19 +45,37 @@ def summarize_groq_fire(json_file=None):
     else:
         json_file = Path(json_file)
 
-    # Load ANY JSON (array or JSONL)
+    raw = json_file.read_bytes()
+
+    # Same input file as the saved summary → nothing to redo
+    input_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    summary_path = DATA_DIR / "fire_summary.json"
+    try:
+        if orjson.loads(summary_path.read_bytes()).get("input_hash") == input_hash:
+            print(f"fire_summary.json is up to date for {json_file.name} (cache hit)")
+            return
+    except (OSError, orjson.JSONDecodeError, AttributeError):
+        pass
+
+    # Load ANY JSON (array or JSONL), keeping only the key fields (4 dp is
+    # plenty for the prompt)
     if str(json_file).endswith(".jsonl"):
-        df = pd.read_json(json_file, lines=True)
+        data = [orjson.loads(line) for line in raw.splitlines() if line.strip()]
     else:
-        with open(json_file) as f:
-            data = json.load(f)
-        df = pd.DataFrame(data)
-    
-    # Key fields only
-    df_key = df[['latitude', 'longitude', 'bright_ti4', 'frp', 'confidence', 'acq_date']].round(4)
-    fires_text = df_key.to_json(orient='records', lines=True)
+        data = orjson.loads(raw)
+    rows = [{k: round4(d.get(k)) for k in KEY_COLS} for d in data]
+
+    if len(rows) > CLUSTER_MIN_ROWS:
+        clusters = _cluster_fires(rows)
+        fires_text = (
+            f"{len(rows)} detections grouped into {len(clusters)} spatial clusters "
+            f"(DBSCAN, {CLUSTER_EPS_KM:g} km); lat/lon is the hottest detection, count=1 rows are isolated fires:\n"
+            + "\n".join(orjson.dumps(c).decode() for c in clusters)
+        )
+    else:
+        fires_text = "".join(orjson.dumps(r).decode() + "\n" for r in rows)
     
-    print(f"Loaded {len(df_key)} fire detections")
+    print(f"Loaded {len(rows)} fire detections")
 
 
 
@@ -73,21 +115,82 @@ JSON response only:
   "predictions": [{{"lat": num, "lon": num, "risk": "High", "reason": "FRP 6MW intense fire"}}]
 }}"""
 
-    chat = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.1
-    )
-    
-    summary = chat.choices[0].message.content
+    request = {
+        "model": "llama-3.3-70b-versatile",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.1,
+    }
+    # Same fire data → same prompt: reuse the summary instead of calling Groq
+    key = cache_key(request)
+    summary = load_cached(key, ttl=SUMMARY_CACHE_TTL_SECONDS)
+    if summary is None:
+        chat = client.chat.completions.create(**request)
+        summary = chat.choices[0].message.content
+        save_cached(key, summary)
     print("Groq Summary:")
     print(summary)
     
-    with open(DATA_DIR / "fire_summary.json", "w") as f:
-        json.dump({"data_count": len(df_key), "summary": summary}, f, indent=2)
+    summary_path.write_bytes(orjson.dumps(
+        {"data_count": len(rows), "summary": summary, "input_hash": input_hash},
+        option=orjson.OPT_INDENT_2,
+    ))
     print("Saved fire_summary.json")
 
 
+def _cluster_fires(rows):
+    """
+    Group fire detections with DBSCAN (haversine) and summarize each cluster:
+    count, centroid, hottest detection, peak FRP/ti4 and most common
+    confidence. Noise points are kept as single-detection rows (no centroid).
+    """
+    from collections import Counter
+    from sklearn.cluster import DBSCAN
+
+    lats = np.array([r['latitude'] for r in rows], dtype=np.float64)
+    lons = np.array([r['longitude'] for r in rows], dtype=np.float64)
+    frps = np.array([r['frp'] for r in rows], dtype=np.float64)
+    ti4s = np.array([r['bright_ti4'] for r in rows], dtype=np.float64)
+
+    labels = DBSCAN(
+        eps=CLUSTER_EPS_KM / EARTH_RADIUS_KM,
+        min_samples=CLUSTER_MIN_SAMPLES,
+        metric='haversine',
+        algorithm='ball_tree',
+    ).fit_predict(np.radians(np.column_stack([lats, lons])))
+
+    # Stable sort by label, then split into one index run per label
+    order = np.argsort(labels, kind='stable')
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    clusters = []
+    for idx in np.split(order, bounds):
+        if labels[idx[0]] == -1:
+            clusters.extend(
+                {
+                    'count': 1,
+                    'lat': rows[i]['latitude'],
+                    'lon': rows[i]['longitude'],
+                    'frp_max': rows[i]['frp'],
+                    'ti4_max': rows[i]['bright_ti4'],
+                    'confidence': rows[i]['confidence'],
+                }
+                for i in idx.tolist()
+            )
+            continue
+        peak = idx[np.argmax(frps[idx])]
+        clusters.append({
+            'count': len(idx),
+            'lat': rows[peak]['latitude'],
+            'lon': rows[peak]['longitude'],
+            'centroid_lat': round(float(lats[idx].mean()), 4),
+            'centroid_lon': round(float(lons[idx].mean()), 4),
+            'frp_max': rows[peak]['frp'],
+            'ti4_max': float(ti4s[idx].max()),
+            'confidence': Counter(rows[i]['confidence'] for i in idx.tolist()).most_common(1)[0][0],
+        })
+    clusters.sort(key=lambda c: (-c['count'], -c['frp_max']))
+    return clusters
+
+
 # def process_groq_to_map(groq_summary_file="../Data/fire_summary.json", fire_key_file="../Data/fire_key.json"):
 #         # Load Groq summary
 #         with open(groq_summary_file) as f:
@@ -137,37 +240,31 @@ def process_groq_to_map(
     fire_key_path     = DATA_DIR / "fire_key.json"     if fire_key_file is None else Path(fire_key_file)
     map_out_path      = DATA_DIR / "map_fire.json"
 
-    with open(groq_summary_path) as f:
-        groq_data = json.load(f)
+    groq_data = orjson.loads(groq_summary_path.read_bytes())
     groq_text = groq_data["summary"]
 
     start = groq_text.find("{")
     end = groq_text.rfind("}") + 1
     groq_json_str = groq_text[start:end]
 
-    summary_json = json.loads(groq_json_str)
+    summary_json = orjson.loads(groq_json_str)
     predictions = summary_json.get("predictions", [])
 
-    pred_dict = {}
-    for p in predictions:
-        key = f"{p['lat']:.4f},{p['lon']:.4f}"
-        pred_dict[key] = p["risk"]
-
-    with open(fire_key_path) as f:
-        fires = json.load(f)
-    df = pd.DataFrame(fires)
-    all_coords = {
-        f"{row['latitude']:.4f},{row['longitude']:.4f}": "Low"
-        for _, row in df.iterrows()
-    }
+    # "%.4f,%.4f" % (lat, lon) goes through C printf formatting, a bit
+    # quicker than the equivalent f-string per coordinate
+    pred_dict = {"%.4f,%.4f" % (p["lat"], p["lon"]): p["risk"] for p in predictions}
+
+    fires = orjson.loads(fire_key_path.read_bytes())
+    all_coords = dict.fromkeys(
+        ["%.4f,%.4f" % (f["latitude"], f["longitude"]) for f in fires], "Low"
+    )
 
     all_coords.update(pred_dict)
 
-    with open(map_out_path, "w") as f:
-        json.dump(all_coords, f, indent=2)
+    map_out_path.write_bytes(orjson.dumps(all_coords, option=orjson.OPT_INDENT_2))
 
     print("map_fire.json path:", map_out_path)
-    print(json.dumps(dict(list(all_coords.items())[:10]), indent=2))
+    print(orjson.dumps(dict(list(all_coords.items())[:10]), option=orjson.OPT_INDENT_2).decode())
     print(f"Total: {len(all_coords)} coords, High: {sum(1 for v in all_coords.values() if v=='High')}")
 
     return all_coords
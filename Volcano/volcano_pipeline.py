@@ -12,16 +12,26 @@ Usage:
     python volcano_pipeline.py --location 19.4,-155.3   # Get risk for a location
     python volcano_pipeline.py --location "Hawaii"       # Named location lookup
     python volcano_pipeline.py --refresh                 # Force re-pull from APIs
+    python volcano_pipeline.py --refresh --no-cache      # ...revalidating every list
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import csv
+import hashlib
+import heapq
 import math
 import sys
 import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+import numpy as np
+import orjson
+
 # ============================================================
 # CONFIG
 # ============================================================
@@ -30,6 +40,60 @@ USGS_EQ_BASE = "https://earthquake.usgs.gov/fdsnws/event/1"
 
 OUTPUT_DIR = "volcano_data"
 
+# Concurrent USGS earthquake queries during the seismicity pass
+SEISMIC_WORKERS = 16
+# Above this many events the seismicity stats are computed with NumPy
+SEISMIC_NUMPY_MIN = 50
+# USGS FDSN per-query result cap; a bulk pull that reaches it is truncated
+EQ_BULK_LIMIT = 20000
+
+# Numeric fields of an enriched record held as columns (see volcano_columns)
+COLUMN_DTYPES = {
+    "latitude": np.float64,
+    "longitude": np.float64,
+    "is_monitored": bool,
+    "threat_score": np.int64,
+    "alert_score": np.int64,
+    "color_score": np.int64,
+    "eq_count_30d": np.int64,
+    "eq_max_mag_30d": np.float64,
+    "eq_shallow_count": np.int64,
+    "composite_risk_score": np.float64,
+}
+
+# Dtypes for the binary .npz sidecar of the columns: coordinates stay float64
+# so lookups read from it match the JSON exactly; scores fit int8, counts int32
+NPZ_DTYPES = {
+    "latitude": np.float64,
+    "longitude": np.float64,
+    "is_monitored": bool,
+    "threat_score": np.int8,
+    "alert_score": np.int8,
+    "color_score": np.int8,
+    "eq_count_30d": np.int32,
+    "eq_max_mag_30d": np.float32,
+    "eq_shallow_count": np.int32,
+    "composite_risk_score": np.float32,
+}
+
+# ETag / Last-Modified validators + last body per USGS list endpoint, so a
+# refresh can revalidate instead of re-downloading unchanged lists
+HTTP_CACHE_PATH = os.path.join(OUTPUT_DIR, "http_cache.json")
+# HANS lists barely change within the hour: a stored body younger than this is
+# used as is, without even a conditional request
+HANS_CACHE_TTL_SECONDS = 3600
+_http_cache_lock = threading.Lock()
+
+# Shared requests session: pooled keep-alive connections to USGS (no TCP/TLS
+# handshake per call), sized so every seismicity worker plus the list pulls
+# get their own connection, retrying connect errors and transient 429/5xx
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
 # Threat level mapping for numerical scoring
 THREAT_SCORES = {
     "Very High Threat": 5,
@@ -74,15 +138,130 @@ def ensure_output_dir():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
+def _write_json(path, data):
+    """Write indented UTF-8 JSON with orjson (non-JSON values via str())."""
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2))
+
+
+def _write_csv(path, data):
+    """Write enriched records as CSV (nothing is written for an empty list)."""
+    if not data:
+        return
+    # Every record shares enrich_volcano's field order: plain rows skip
+    # DictWriter's per-row dict-to-list conversion
+    keys = list(data[0])
+    with open(path, "w", newline="", encoding="utf-8-sig", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(keys)
+        writer.writerows([v.get(k, "") for k in keys] for v in data)
+
+
+def _write_bytes(path, body):
+    """Write an already serialized file body."""
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+def _json_digest(body):
+    """blake2b hex digest of a serialized JSON body."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _write_npz(path, cols, json_digest):
+    """
+    Save volcano_columns() arrays as a binary .npz (NPZ_DTYPES), in record
+    order, tagged with the digest of the JSON written alongside them.
+    """
+    np.savez(
+        path,
+        json_digest=np.array(json_digest),
+        **{key: cols[key].astype(dtype) for key, dtype in NPZ_DTYPES.items()},
+    )
+
+
+def _write_json_if_changed(path, data):
+    """
+    Like _write_json, but skip the write when the bytes match the last run's
+    (blake2b digest kept in a .hash sidecar). Returns True if written.
+    """
+    body = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+    digest = _json_digest(body)
+    hash_path = os.path.splitext(path)[0] + ".hash"
+    try:
+        with open(hash_path) as f:
+            if f.read() == digest and os.path.exists(path):
+                return False
+    except OSError:
+        pass
+    with open(path, "wb") as f:
+        f.write(body)
+    with open(hash_path, "w") as f:
+        f.write(digest)
+    return True
+
+
 # ============================================================
 # STEP 1: PULL ALL USGS HANS DATA
 # ============================================================
+def _get_json_conditional(url, timeout=30, max_age=HANS_CACHE_TTL_SECONDS):
+    """
+    GET a JSON endpoint with If-None-Match / If-Modified-Since from the last
+    run; a 304 Not Modified returns the stored body without a transfer.
+    A stored body fetched less than max_age seconds ago is returned without
+    any request (max_age=0 always revalidates).
+    """
+    try:
+        with open(HTTP_CACHE_PATH, "rb") as f:
+            http_cache = orjson.loads(f.read())
+    except (OSError, ValueError):
+        http_cache = {}
+
+    entry = http_cache.get(url)
+    now = datetime.now().timestamp()
+    if entry and now - entry.get("fetched_at", 0) < max_age:
+        return entry["body"]
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    r = _http.get(url, headers=headers, timeout=timeout)
+    if r.status_code == 304 and entry:
+        entry = {**entry, "fetched_at": now}
+    else:
+        r.raise_for_status()
+        entry = {
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "body": r.json(),
+        }
+
+    # Lists may be pulled concurrently: re-read under the lock so no other
+    # endpoint's entry is lost, and swap the file in atomically
+    with _http_cache_lock:
+        try:
+            with open(HTTP_CACHE_PATH, "rb") as f:
+                http_cache = orjson.loads(f.read())
+        except (OSError, ValueError):
+            http_cache = {}
+        http_cache[url] = entry
+        ensure_output_dir()
+        tmp_path = f"{HTTP_CACHE_PATH}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(http_cache))
+        os.replace(tmp_path, HTTP_CACHE_PATH)
+    return entry["body"]
+
+
 def pull_all_volcanoes():
     """Pull all US volcanoes from HANS API."""
     print("\n📡 Pulling all US volcanoes from USGS HANS API...")
-    r = requests.get(f"{USGS_HANS_BASE}/getUSVolcanoes", timeout=30)
-    r.raise_for_status()
-    volcanoes = r.json()
+    volcanoes = _get_json_conditional(f"{USGS_HANS_BASE}/getUSVolcanoes", timeout=30)
     print(f"   ✅ Got {len(volcanoes)} US volcanoes")
     return volcanoes
 
@@ -90,9 +269,7 @@ def pull_all_volcanoes():
 def pull_monitored_volcanoes():
     """Pull actively monitored volcanoes."""
     print("📡 Pulling monitored volcanoes...")
-    r = requests.get(f"{USGS_HANS_BASE}/getMonitoredVolcanoes", timeout=30)
-    r.raise_for_status()
-    data = r.json()
+    data = _get_json_conditional(f"{USGS_HANS_BASE}/getMonitoredVolcanoes", timeout=30)
     print(f"   ✅ Got {len(data)} monitored volcanoes")
     return data
 
@@ -100,9 +277,7 @@ def pull_monitored_volcanoes():
 def pull_elevated_volcanoes():
     """Pull volcanoes with elevated alert status."""
     print("📡 Pulling elevated/active alert volcanoes...")
-    r = requests.get(f"{USGS_HANS_BASE}/getElevatedVolcanoes", timeout=30)
-    r.raise_for_status()
-    data = r.json()
+    data = _get_json_conditional(f"{USGS_HANS_BASE}/getElevatedVolcanoes", timeout=30)
     print(f"   ✅ Got {len(data)} elevated volcanoes")
     return data
 
@@ -110,7 +285,7 @@ def pull_elevated_volcanoes():
 def pull_volcano_detail(vnum):
     """Pull detailed info for a specific volcano."""
     try:
-        r = requests.get(f"{USGS_HANS_BASE}/getVolcano/{vnum}", timeout=15)
+        r = _http.get(f"{USGS_HANS_BASE}/getVolcano/{vnum}", timeout=15)
         r.raise_for_status()
         return r.json()
     except Exception:
@@ -120,7 +295,7 @@ def pull_volcano_detail(vnum):
 def pull_newest_notice(vnum):
     """Pull the latest HANS notice for a volcano."""
     try:
-        r = requests.get(f"{USGS_HANS_BASE}/newestForVolcano/{vnum}", timeout=15)
+        r = _http.get(f"{USGS_HANS_BASE}/newestForVolcano/{vnum}", timeout=15)
         r.raise_for_status()
         return r.json()
     except Exception:
@@ -143,7 +318,7 @@ def pull_nearby_earthquakes(lat, lon, radius_km=50, days=30, min_mag=1.0):
             "limit": 500,
             "orderby": "time",
         }
-        r = requests.get(f"{USGS_EQ_BASE}/query", params=params, timeout=30)
+        r = _http.get(f"{USGS_EQ_BASE}/query", params=params, timeout=30)
         r.raise_for_status()
         data = r.json()
         return data.get("features", [])
@@ -151,42 +326,123 @@ def pull_nearby_earthquakes(lat, lon, radius_km=50, days=30, min_mag=1.0):
         return []
 
 
+def pull_earthquakes_bulk(points, radius_km=50, days=30, min_mag=1.0, per_point_limit=500):
+    """
+    Pull recent earthquakes for many volcanoes with ONE USGS query over the
+    box enclosing all their search circles, then bucket the events to each
+    point locally.
+
+    Returns one (n, 2) [mag, depth_km] array per point (see _quake_array;
+    newest first, capped at per_point_limit like pull_nearby_earthquakes),
+    or None when the query failed or hit the server's result cap, so
+    callers can fall back to per-volcano queries.
+    """
+    end = datetime.utcnow()
+    start = end - timedelta(days=days)
+    lats = np.array([p[0] for p in points], dtype=np.float64)
+    lons = np.array([p[1] for p in points], dtype=np.float64)
+    min_lon, max_lon = _lon_range(lons, lats, radius_km)
+    pad_lat = math.degrees(radius_km / 6371)
+    try:
+        params = {
+            "format": "geojson",
+            "starttime": start.strftime("%Y-%m-%d"),
+            "endtime": end.strftime("%Y-%m-%d"),
+            "minlatitude": max(float(lats.min()) - pad_lat, -90),
+            "maxlatitude": min(float(lats.max()) + pad_lat, 90),
+            "minlongitude": min_lon,
+            "maxlongitude": max_lon,
+            "minmagnitude": min_mag,
+            "limit": EQ_BULK_LIMIT,
+            "orderby": "time",
+        }
+        r = _http.get(f"{USGS_EQ_BASE}/query", params=params, timeout=60)
+        r.raise_for_status()
+        features = r.json().get("features", [])
+    except Exception:
+        return None
+    if len(features) >= EQ_BULK_LIMIT:
+        return None  # truncated: some volcanoes would miss events
+
+    # Events without a location can't be bucketed (the circle query never
+    # returns them either)
+    located = [f for f in features if len((f.get("geometry") or {}).get("coordinates") or ()) >= 2]
+    if not located:
+        return [np.empty((0, 2)) for _ in points]
+    eq_lons = np.array([f["geometry"]["coordinates"][0] for f in located], dtype=np.float64)
+    eq_lats = np.array([f["geometry"]["coordinates"][1] for f in located], dtype=np.float64)
+
+    quakes = _quake_array(located)
+
+    buckets = []
+    for lat, lon in points:
+        cand = np.flatnonzero(_bbox_mask(lat, lon, eq_lats, eq_lons, radius_km))
+        dists = haversine_km(lat, lon, eq_lats[cand], eq_lons[cand])
+        buckets.append(quakes[cand[dists <= radius_km][:per_point_limit]])
+    return buckets
+
+
+def _lon_range(lons, lats, radius_km):
+    """
+    Smallest longitude interval covering every point's search circle, taking
+    the way round the antimeridian that skips the largest gap. The maximum
+    may exceed 180 (USGS accepts [-360, 360]); the full globe if unbounded.
+    """
+    ang = radius_km / 6371
+    max_abs_lat = float(np.abs(lats).max()) + math.degrees(ang)
+    if max_abs_lat >= 90:
+        return -180.0, 180.0
+    pad = math.degrees(math.asin(math.sin(ang) / math.cos(math.radians(max_abs_lat))))
+
+    ring = np.sort(lons % 360)
+    gaps = np.diff(np.append(ring, ring[0] + 360))
+    k = int(np.argmax(gaps))
+    start = float(ring[(k + 1) % len(ring)])
+    end = float(ring[k])
+    if end < start:
+        end += 360
+    if start >= 180:
+        start -= 360
+        end -= 360
+    if end - start + 2 * pad >= 360:
+        return -180.0, 180.0
+    return start - pad, end + pad
+
+
 # ============================================================
 # STEP 2: BUILD ENRICHED DATASET
 # ============================================================
 def haversine_km(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in km."""
+    """Calculate distance between two points in km (elementwise on arrays)."""
     R = 6371
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (math.sin(dlat / 2) ** 2 +
-         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-         math.sin(dlon / 2) ** 2)
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    dlat = np.radians(lat2 - lat1)
+    dlon = np.radians(lon2 - lon1)
+    a = (np.sin(dlat / 2) ** 2 +
+         np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) *
+         np.sin(dlon / 2) ** 2)
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
 
 def enrich_volcano(volcano, elevated_map, monitored_set):
     """Enrich a single volcano record with all useful fields."""
-    vnum = volcano.get("vnum", "")
-    lat = volcano.get("latitude")
-    lon = volcano.get("longitude")
+    get = volcano.get
+    vnum = get("vnum", "")
+    threat = get("nvews_threat", "Unassigned")
 
     # Base fields
     enriched = {
         # --- IDENTITY ---
         "vnum": vnum,
-        "volcano_name": volcano.get("volcano_name", ""),
-        "region": volcano.get("region", ""),
-        "latitude": lat,
-        "longitude": lon,
-        "elevation_meters": volcano.get("elevation_meters"),
+        "volcano_name": get("volcano_name", ""),
+        "region": get("region", ""),
+        "latitude": get("latitude"),
+        "longitude": get("longitude"),
+        "elevation_meters": get("elevation_meters"),
 
         # --- STATUS FLAGS ---
         "is_monitored": vnum in monitored_set,
-        "nvews_threat": volcano.get("nvews_threat", "Unassigned"),
-        "threat_score": THREAT_SCORES.get(
-            volcano.get("nvews_threat", "Unassigned"), 0
-        ),
+        "nvews_threat": threat,
+        "threat_score": THREAT_SCORES.get(threat, 0),
 
         # --- ALERT STATUS (from elevated data if available) ---
         "alert_level": None,
@@ -195,13 +451,13 @@ def enrich_volcano(volcano, elevated_map, monitored_set):
         "color_score": 0,
 
         # --- OBSERVATORY ---
-        "obs_abbr": volcano.get("obs_abbr", ""),
-        "obs_fullname": volcano.get("obs_fullname", ""),
+        "obs_abbr": get("obs_abbr", ""),
+        "obs_fullname": get("obs_fullname", ""),
 
         # --- LINKS ---
-        "volcano_url": volcano.get("volcano_url", ""),
-        "volcano_image_url": volcano.get("volcano_image_url", ""),
-        "hans_url": volcano.get("hans_url", ""),
+        "volcano_url": get("volcano_url", ""),
+        "volcano_image_url": get("volcano_image_url", ""),
+        "hans_url": get("hans_url", ""),
 
         # --- SEISMICITY (enriched later) ---
         "eq_count_30d": 0,
@@ -215,54 +471,91 @@ def enrich_volcano(volcano, elevated_map, monitored_set):
     }
 
     # Merge elevated status if available
-    if vnum in elevated_map:
-        elev = elevated_map[vnum]
+    elev = elevated_map.get(vnum)
+    if elev is not None:
         alert = elev.get("alert_level") or elev.get("alertLevel")
         color = elev.get("color_code") or elev.get("colorCode")
         enriched["alert_level"] = alert
         enriched["color_code"] = color
-        enriched["alert_score"] = ALERT_SCORES.get(
-            str(alert).upper() if alert else None, 0
-        )
-        enriched["color_score"] = COLOR_SCORES.get(
-            str(color).upper() if color else None, 0
-        )
+        # Score keys are upper-case; anything that isn't a string scores 0
+        enriched["alert_score"] = ALERT_SCORES.get(alert.upper(), 0) if isinstance(alert, str) else 0
+        enriched["color_score"] = COLOR_SCORES.get(color.upper(), 0) if isinstance(color, str) else 0
 
     return enriched
 
 
-def enrich_with_seismicity(enriched, earthquakes):
-    """Add earthquake statistics to the enriched record."""
-    if not earthquakes:
-        return enriched
+def _quake_array(earthquakes):
+    """(n, 2) float array of [mag, depth_km] per GeoJSON feature, NaN where missing."""
+    mags = [eq.get("properties", {}).get("mag") for eq in earthquakes]
+    coords = [eq.get("geometry", {}).get("coordinates", [0, 0, 0]) for eq in earthquakes]
+    depths = [c[2] if len(c) > 2 else 0 for c in coords]
+    return np.array([mags, depths], dtype=np.float64).T.reshape(-1, 2)
+
 
-    mags = []
-    depths = []
-    shallow = 0
+def enrich_with_seismicity(enriched, earthquakes):
+    """
+    Add earthquake statistics to the enriched record.
 
-    for eq in earthquakes:
-        props = eq.get("properties", {})
-        geom = eq.get("geometry", {})
-        mag = props.get("mag")
-        coords = geom.get("coordinates", [0, 0, 0])
-        depth = coords[2] if len(coords) > 2 else 0
+    earthquakes is a list of GeoJSON features, or an (n, 2) array of
+    [mag, depth_km] rows (NaN where missing) as built by _quake_array.
+    """
+    if len(earthquakes) == 0:
+        return enriched
 
-        if mag is not None:
-            mags.append(mag)
-        if depth is not None:
-            depths.append(depth)
-            if depth < 5:
-                shallow += 1
+    if isinstance(earthquakes, np.ndarray) or len(earthquakes) > SEISMIC_NUMPY_MIN:
+        arr = earthquakes if isinstance(earthquakes, np.ndarray) else _quake_array(earthquakes)
+        mags = arr[:, 0]
+        depths = arr[:, 1]
+        mags = mags[~np.isnan(mags)]
+        depths = depths[~np.isnan(depths)]
+        mag_n, depth_n = mags.size, depths.size
+        mag_max = float(mags.max()) if mag_n else 0.0
+        mag_sum = float(mags.sum())
+        depth_sum = float(depths.sum())
+        shallow = int(np.count_nonzero(depths < 5))
+    else:
+        # Few events: one fused pass with running totals beats building arrays
+        mag_max = float("-inf")
+        mag_sum = depth_sum = 0.0
+        mag_n = depth_n = shallow = 0
+        for eq in earthquakes:
+            mag = eq.get("properties", {}).get("mag")
+            coords = eq.get("geometry", {}).get("coordinates", [0, 0, 0])
+            depth = coords[2] if len(coords) > 2 else 0
+            if mag is not None:
+                mag_n += 1
+                mag_sum += mag
+                if mag > mag_max:
+                    mag_max = mag
+            if depth is not None:
+                depth_n += 1
+                depth_sum += depth
+                if depth < 5:
+                    shallow += 1
+        mag_max = float(mag_max) if mag_n else 0.0
 
     enriched["eq_count_30d"] = len(earthquakes)
-    enriched["eq_max_mag_30d"] = max(mags) if mags else 0.0
-    enriched["eq_avg_mag_30d"] = round(sum(mags) / len(mags), 2) if mags else 0.0
-    enriched["eq_avg_depth_km"] = round(sum(depths) / len(depths), 2) if depths else 0.0
-    enriched["eq_shallow_count"] = shallow
+    enriched["eq_max_mag_30d"] = mag_max
+    enriched["eq_avg_mag_30d"] = round(mag_sum / mag_n, 2) if mag_n else 0.0
+    enriched["eq_avg_depth_km"] = round(depth_sum / depth_n, 2) if depth_n else 0.0
+    enriched["eq_shallow_count"] = shallow  # depth < 5km
 
     return enriched
 
 
+# Composite risk score components: (field, normalizing divisor, cap the
+# normalized value at 1.0, weight). Weights sum to 100.
+RISK_COMPONENTS = (
+    ("threat_score", 5.0, False, 25),
+    ("alert_score", 4.0, False, 25),
+    ("color_score", 4.0, False, 15),
+    # Seismicity: cap at reasonable maximums for normalization
+    ("eq_count_30d", 200.0, True, 15),
+    ("eq_max_mag_30d", 6.0, True, 10),
+    ("eq_shallow_count", 50.0, True, 10),
+)
+
+
 def compute_risk_score(enriched):
     """
     Compute a composite risk score (0-100) based on available features.
@@ -275,33 +568,35 @@ def compute_risk_score(enriched):
         - Max earthquake mag:      10%  (intensity of seismic unrest)
         - Shallow earthquakes:     10%  (magma movement indicator)
     """
-    # Normalize each component to 0-1
-    threat_norm = enriched["threat_score"] / 5.0
-    alert_norm = enriched["alert_score"] / 4.0
-    color_norm = enriched["color_score"] / 4.0
-
-    # Seismicity: cap at reasonable maximums for normalization
-    eq_count_norm = min(enriched["eq_count_30d"] / 200.0, 1.0)
-    eq_mag_norm = min(enriched["eq_max_mag_30d"] / 6.0, 1.0)
-    eq_shallow_norm = min(enriched["eq_shallow_count"] / 50.0, 1.0)
-
-    score = (
-        threat_norm * 25 +
-        alert_norm * 25 +
-        color_norm * 15 +
-        eq_count_norm * 15 +
-        eq_mag_norm * 10 +
-        eq_shallow_norm * 10
-    )
+    score = 0.0
+    for field, scale, capped, weight in RISK_COMPONENTS:
+        norm = enriched[field] / scale
+        if capped:
+            norm = min(norm, 1.0)
+        score += norm * weight
 
     enriched["composite_risk_score"] = round(score, 1)
     return enriched
 
 
+def compute_risk_scores(cols):
+    """
+    compute_risk_score over a whole volcano_columns() view at once (same
+    RISK_COMPONENTS, same summation order). Returns the unrounded scores.
+    """
+    score = 0.0
+    for field, scale, capped, weight in RISK_COMPONENTS:
+        norm = cols[field] / scale
+        if capped:
+            norm = np.minimum(norm, 1.0)
+        score = score + norm * weight
+    return score
+
+
 # ============================================================
 # STEP 3: FULL PIPELINE
 # ============================================================
-def run_full_pipeline(with_seismicity=True, seismic_limit=None):
+def run_full_pipeline(with_seismicity=True, seismic_limit=None, use_http_cache=True):
     """
     Run the complete data pipeline:
     1. Pull all volcano lists
@@ -309,78 +604,124 @@ def run_full_pipeline(with_seismicity=True, seismic_limit=None):
     3. Optionally add seismicity
     4. Compute risk scores
     5. Save to CSV + JSON
+
+    use_http_cache=False revalidates every HANS list instead of reusing one
+    fetched within the last HANS_CACHE_TTL_SECONDS.
     """
     ensure_output_dir()
-
-    # Pull raw data
-    all_volcanoes = pull_all_volcanoes()
-    monitored = pull_monitored_volcanoes()
-    elevated = pull_elevated_volcanoes()
+    max_age = HANS_CACHE_TTL_SECONDS if use_http_cache else 0
+
+    # Pull raw data: the three lists are independent requests, fetch them together
+    print("\n📡 Pulling all, monitored and elevated US volcanoes from USGS HANS API...")
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        lists = [
+            pool.submit(
+                _get_json_conditional, f"{USGS_HANS_BASE}/{endpoint}", timeout=30, max_age=max_age
+            )
+            for endpoint in ("getUSVolcanoes", "getMonitoredVolcanoes", "getElevatedVolcanoes")
+        ]
+        all_volcanoes, monitored, elevated = (f.result() for f in lists)
+    print(f"   ✅ Got {len(all_volcanoes)} US volcanoes, {len(monitored)} monitored, "
+          f"{len(elevated)} elevated")
 
     # Build lookup structures
-    monitored_set = set()
-    for v in monitored:
-        vnum = v.get("vnum", "")
-        if vnum:
-            monitored_set.add(vnum)
-
-    elevated_map = {}
-    for v in elevated:
-        vnum = v.get("vnum", "")
-        if vnum:
-            elevated_map[vnum] = v
+    monitored_set = {v["vnum"] for v in monitored if v.get("vnum")}
+    elevated_map = {v["vnum"]: v for v in elevated if v.get("vnum")}
 
     # Enrich each volcano
     print(f"\n🔧 Enriching {len(all_volcanoes)} volcanoes...")
-    enriched_list = []
-    for i, volcano in enumerate(all_volcanoes):
-        enriched = enrich_volcano(volcano, elevated_map, monitored_set)
-
-        # Add seismicity for monitored/elevated volcanoes
-        if with_seismicity and enriched["is_monitored"]:
-            if seismic_limit and i >= seismic_limit:
-                pass  # skip seismicity for speed
-            elif enriched["latitude"] and enriched["longitude"]:
-                lat = enriched["latitude"]
-                lon = enriched["longitude"]
-                print(f"   🔍 [{i+1}/{len(all_volcanoes)}] Seismicity for {enriched['volcano_name']}...", end="")
-                eqs = pull_nearby_earthquakes(lat, lon, radius_km=50, days=30)
-                enriched = enrich_with_seismicity(enriched, eqs)
-                print(f" {enriched['eq_count_30d']} earthquakes")
-
-        enriched = compute_risk_score(enriched)
-        enriched_list.append(enriched)
-
-    # Sort by risk score descending
-    enriched_list.sort(key=lambda x: x["composite_risk_score"], reverse=True)
-
-    # Save to JSON
+    enriched_list = [enrich_volcano(v, elevated_map, monitored_set) for v in all_volcanoes]
+
+    # Add seismicity for monitored/elevated volcanoes: one bulk USGS query per
+    # region, bucketed locally; regions whose bulk pull fails or is truncated
+    # fall back to one query per volcano. All queries run concurrently.
+    if with_seismicity:
+        seismic_idx = [
+            i for i, e in enumerate(enriched_list)
+            if e["is_monitored"]
+            and not (seismic_limit and i >= seismic_limit)  # skip seismicity for speed
+            and e["latitude"] is not None and e["longitude"] is not None
+        ]
+        by_region = {}
+        for i in seismic_idx:
+            by_region.setdefault(enriched_list[i]["region"], []).append(i)
+
+        eq_lists = {}
+        with ThreadPoolExecutor(max_workers=SEISMIC_WORKERS) as pool:
+            bulk = {
+                region: pool.submit(
+                    pull_earthquakes_bulk,
+                    [(enriched_list[i]["latitude"], enriched_list[i]["longitude"]) for i in idx],
+                    radius_km=50, days=30,
+                )
+                for region, idx in by_region.items()
+            }
+            single = {}
+            for region, future in bulk.items():
+                buckets = future.result()
+                if buckets is None:
+                    for i in by_region[region]:
+                        single[i] = pool.submit(
+                            pull_nearby_earthquakes,
+                            enriched_list[i]["latitude"], enriched_list[i]["longitude"],
+                            radius_km=50, days=30,
+                        )
+                else:
+                    eq_lists.update(zip(by_region[region], buckets))
+            for i, future in single.items():
+                eq_lists[i] = future.result()
+
+        # Apply results in volcano order; progress lines go out in one write
+        progress = []
+        for i in seismic_idx:
+            enriched = enrich_with_seismicity(enriched_list[i], eq_lists[i])
+            progress.append(f"   🔍 [{i+1}/{len(all_volcanoes)}] Seismicity for {enriched['volcano_name']}... "
+                            f"{enriched['eq_count_30d']} earthquakes\n")
+        sys.stdout.write("".join(progress))
+
+    # Score every volcano in one vectorized pass
+    cols = volcano_columns(enriched_list)
+    scores = [round(score, 1) for score in compute_risk_scores(cols).tolist()]
+    for enriched, score in zip(enriched_list, scores):
+        enriched["composite_risk_score"] = score
+    cols["composite_risk_score"] = np.array(scores, dtype=np.float64)
+
+    # Sort by risk score descending (stable, ties keep pull order), reordering
+    # the columnar view alongside for the summary and elevated filter below
+    order = np.argsort(-cols["composite_risk_score"], kind="stable")
+    enriched_list = [enriched_list[i] for i in order.tolist()]
+    cols = {k: col[order] for k, col in cols.items()}
+
+    # Save JSON, CSV, the numeric columns as .npz and the elevated details
+    # (the most important ones) concurrently: the outputs are independent files
     json_path = os.path.join(OUTPUT_DIR, "volcanoes_enriched.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(enriched_list, f, indent=2, default=str, ensure_ascii=False)
-    print(f"\n💾 Saved enriched JSON → {json_path}")
-
-    # Save to CSV
+    json_body = orjson.dumps(enriched_list, default=str)  # compact: machine-read cache
     csv_path = os.path.join(OUTPUT_DIR, "volcanoes_enriched.csv")
-    if enriched_list:
-        keys = enriched_list[0].keys()
-        with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(enriched_list)
+    npz_path = os.path.join(OUTPUT_DIR, "volcanoes_enriched.npz")
+    ep = os.path.join(OUTPUT_DIR, "elevated_volcanoes.json")
+    elevated_details = [enriched_list[i] for i in np.flatnonzero(cols["alert_score"] > 1).tolist()]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        writes = [
+            pool.submit(_write_bytes, json_path, json_body),
+            pool.submit(_write_csv, csv_path, enriched_list),
+            pool.submit(_write_npz, npz_path, cols, _json_digest(json_body)),
+        ]
+        elevated_written = pool.submit(_write_json_if_changed, ep, elevated_details) if elevated_details else None
+        for future in writes:
+            future.result()
+    print(f"\n💾 Saved enriched JSON → {json_path}")
     print(f"💾 Saved enriched CSV → {csv_path}")
+    print(f"💾 Saved numeric columns → {npz_path}")
 
     # Print summary
-    print_data_quality(enriched_list)
+    print_data_quality(enriched_list, cols)
     print_top_risk(enriched_list)
 
-    # Save elevated details separately (these are the most important)
-    elevated_details = [v for v in enriched_list if v["alert_score"] > 1]
-    if elevated_details:
-        ep = os.path.join(OUTPUT_DIR, "elevated_volcanoes.json")
-        with open(ep, "w", encoding="utf-8") as f:
-            json.dump(elevated_details, f, indent=2, default=str, ensure_ascii=False)
-        print(f"💾 Saved elevated details → {ep}")
+    if elevated_written is not None:
+        if elevated_written.result():
+            print(f"💾 Saved elevated details → {ep}")
+        else:
+            print(f"💾 Elevated details unchanged → {ep}")
 
     return enriched_list
 
@@ -388,13 +729,44 @@ def run_full_pipeline(with_seismicity=True, seismic_limit=None):
 # ============================================================
 # STEP 4: DATA QUALITY + SUMMARY
 # ============================================================
-def print_data_quality(data):
-    """Print data quality stats."""
+def volcano_columns(data):
+    """
+    Columnar (dict-of-arrays) view of the numeric fields of enriched
+    records, for vectorized stats, sorting and filtering. Missing
+    coordinates become NaN.
+    """
+    return {
+        key: np.array([v[key] for v in data], dtype=dtype)
+        for key, dtype in COLUMN_DTYPES.items()
+    }
+
+
+def load_volcano_columns(path, json_digest):
+    """
+    Read the volcano_columns() arrays saved by _write_npz. Returns None if the
+    file is missing or unreadable, or was saved with a different JSON than the
+    one whose digest is given (records are risk-sorted, so rows only line up
+    within one run).
+    """
+    try:
+        with np.load(path) as npz:
+            if str(npz["json_digest"]) != json_digest:
+                return None
+            return {key: npz[key] for key in NPZ_DTYPES}
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def print_data_quality(data, cols=None):
+    """Print data quality stats (cols: volcano_columns(data), if already built)."""
+    if cols is None:
+        cols = volcano_columns(data)
     total = len(data)
-    monitored = sum(1 for v in data if v["is_monitored"])
-    with_alert = sum(1 for v in data if v["alert_score"] > 0)
-    with_eq = sum(1 for v in data if v["eq_count_30d"] > 0)
-    with_coords = sum(1 for v in data if v["latitude"] and v["longitude"])
+    monitored = int(np.count_nonzero(cols["is_monitored"]))
+    with_alert = int(np.count_nonzero(cols["alert_score"] > 0))
+    with_eq = int(np.count_nonzero(cols["eq_count_30d"] > 0))
+    # Missing coordinates are NaN in the columnar view (0 is a real coordinate)
+    with_coords = int(np.count_nonzero(~(np.isnan(cols["latitude"]) | np.isnan(cols["longitude"]))))
 
     print("\n" + "=" * 70)
     print("  📊 DATA QUALITY")
@@ -407,14 +779,16 @@ def print_data_quality(data):
 
 
 def print_top_risk(data):
-    """Print the highest-risk volcanoes."""
+    """Print the highest-risk volcanoes (data need not be sorted)."""
     print("\n" + "=" * 70)
     print("  🌋 TOP 15 VOLCANOES BY RISK SCORE")
     print("=" * 70)
     print(f"  {'#':<3} {'Volcano':<22} {'Region':<15} {'Threat':<12} "
           f"{'Alert':<9} {'EQ/30d':<7} {'Risk':>5}")
     print("  " + "-" * 75)
-    for i, v in enumerate(data[:15]):
+    # Partial top-15 selection; ties keep their order in data like a stable sort
+    top = heapq.nlargest(15, data, key=lambda v: v["composite_risk_score"])
+    for i, v in enumerate(top):
         alert = v['alert_level'] or '-'
         print(f"  {i+1:<3} {v['volcano_name']:<22} {v['region']:<15} "
               f"{v['nvews_threat']:<12} {alert:<9} "
@@ -424,27 +798,75 @@ def print_top_risk(data):
 # ============================================================
 # STEP 5: LOCATION-BASED RISK LOOKUP
 # ============================================================
-def get_nearby_volcanoes(data, user_lat, user_lon, radius_km=500, top_n=10):
-    """Find volcanoes near a user location, sorted by proximity."""
-    nearby = []
-    for v in data:
-        if v["latitude"] and v["longitude"]:
-            dist = haversine_km(user_lat, user_lon, v["latitude"], v["longitude"])
-            v_copy = dict(v)
-            v_copy["distance_to_user_km"] = round(dist, 1)
-            nearby.append(v_copy)
+def _bbox_mask(user_lat, user_lon, lats, lons, radius_km):
+    """
+    Cheap degree-space prefilter: True for points inside the lat/lon box that
+    encloses the radius circle (wrapping at the antimeridian). Never drops a
+    point that the haversine check would keep.
+    """
+    ang = radius_km / 6371 + 1e-9  # angular radius (rad), small safety margin
+    dlat = math.degrees(ang)
+    mask = np.abs(lats - user_lat) <= dlat
+    if abs(user_lat) + dlat < 90:
+        # Widest longitude offset the circle reaches at any latitude
+        dlon = math.degrees(math.asin(math.sin(ang) / math.cos(math.radians(user_lat)))) + 1e-6
+        mask &= np.abs((lons - user_lon + 180) % 360 - 180) <= dlon
+    return mask
 
-    nearby.sort(key=lambda x: x["distance_to_user_km"])
-    within_radius = [v for v in nearby if v["distance_to_user_km"] <= radius_km]
 
-    return within_radius[:top_n]
+def get_nearby_volcanoes(data, user_lat, user_lon, radius_km=500, top_n=10, cols=None):
+    """
+    Find volcanoes near a user location, sorted by proximity (cols: the
+    volcano_columns() of data, e.g. from load_volcano_columns, if at hand).
+    """
+    # Bounding-box prefilter, then one vectorized haversine over the
+    # candidates; only the ones in range are rounded, sorted and copied
+    if cols is None:
+        idx = [i for i, v in enumerate(data) if v["latitude"] is not None and v["longitude"] is not None]
+        lats = np.array([data[i]["latitude"] for i in idx], dtype=np.float64)
+        lons = np.array([data[i]["longitude"] for i in idx], dtype=np.float64)
+    else:
+        # Missing coordinates are NaN in the columnar view
+        has_coords = ~(np.isnan(cols["latitude"]) | np.isnan(cols["longitude"]))
+        lats = cols["latitude"][has_coords]
+        lons = cols["longitude"][has_coords]
+        idx = np.flatnonzero(has_coords).tolist()
+    if not idx:
+        return []
+    # The radius test applies to the reported distance (rounded to 0.1 km),
+    # which can be up to 0.05 km over radius_km raw: prefilter with that slack
+    slack_km = radius_km + 0.05
+    cand = np.flatnonzero(_bbox_mask(user_lat, user_lon, lats, lons, slack_km))
+    dists = haversine_km(user_lat, user_lon, lats[cand], lons[cand])
+
+    hits = np.flatnonzero(dists <= slack_km)
+    if hits.size > top_n > 0:
+        # Top-k by partition instead of sorting every hit: keep the hits
+        # within 0.1 km of the top_n-th distance, since anything farther
+        # rounds strictly past it (stays in candidate order for stable ties)
+        kth = np.partition(dists[hits], top_n - 1)[top_n - 1]
+        hits = hits[dists[hits] <= kth + 0.1]
+
+    within_radius = []
+    for j in hits.tolist():
+        dist = round(float(dists[j]), 1)
+        if dist <= radius_km:
+            within_radius.append((dist, idx[cand[j]]))
+    within_radius.sort(key=lambda x: x[0])
+
+    nearby = []
+    for dist, i in within_radius[:top_n]:
+        v_copy = dict(data[i])
+        v_copy["distance_to_user_km"] = dist
+        nearby.append(v_copy)
+    return nearby
 
 
-def location_risk_lookup(data, user_lat, user_lon):
-    """Find nearby volcanoes and print risk summary."""
+def location_risk_lookup(data, user_lat, user_lon, cols=None):
+    """Find nearby volcanoes and print risk summary (cols: see get_nearby_volcanoes)."""
     print(f"\n📍 Location risk lookup: ({user_lat}, {user_lon})")
 
-    nearby = get_nearby_volcanoes(data, user_lat, user_lon, radius_km=500, top_n=10)
+    nearby = get_nearby_volcanoes(data, user_lat, user_lon, radius_km=500, top_n=10, cols=cols)
     print(f"   Found {len(nearby)} volcanoes within 500km")
 
     if nearby:
@@ -466,8 +888,7 @@ def location_risk_lookup(data, user_lat, user_lon):
     }
     result_path = os.path.join(OUTPUT_DIR, "risk_assessment.json")
     ensure_output_dir()
-    with open(result_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, default=str, ensure_ascii=False)
+    _write_json(result_path, result)
     print(f"\n💾 Saved assessment → {result_path}")
 
     return result
@@ -490,10 +911,17 @@ def main():
     if os.path.exists(json_path) and "--refresh" not in sys.argv:
         print(f"📂 Loading cached data from {json_path}")
         print(f"   (use --refresh to re-pull from APIs)")
-        with open(json_path, encoding="utf-8") as f:
-            data = json.load(f)
+        with open(json_path, "rb") as f:
+            body = f.read()
+        data = orjson.loads(body)
+        # Coordinates for the lookup come from the .npz sidecar when it was
+        # saved with this JSON; names, regions and URLs still come from the JSON
+        cols = load_volcano_columns(os.path.join(OUTPUT_DIR, "volcanoes_enriched.npz"), _json_digest(body))
     else:
-        data = run_full_pipeline(with_seismicity=True, seismic_limit=None)
+        data = run_full_pipeline(
+            with_seismicity=True, seismic_limit=None, use_http_cache="--no-cache" not in sys.argv
+        )
+        cols = None
 
     # STEP 2: If location given, do risk lookup
     if location:
@@ -502,15 +930,14 @@ def main():
             user_lat = float(parts[0].strip())
             user_lon = float(parts[1].strip())
         else:
-            loc_lower = location.lower().strip()
-            if loc_lower in LOCATION_PRESETS:
-                user_lat, user_lon = LOCATION_PRESETS[loc_lower]
-            else:
+            coords = LOCATION_PRESETS.get(location.lower().strip())
+            if coords is None:
                 print(f"❌ Unknown location: {location}")
-                print(f"   Use lat,lon format or one of: {list(LOCATION_PRESETS.keys())}")
+                print(f"   Use lat,lon format or one of: {list(LOCATION_PRESETS)}")
                 return
+            user_lat, user_lon = coords
 
-        location_risk_lookup(data, user_lat, user_lon)
+        location_risk_lookup(data, user_lat, user_lon, cols)
 
     elif "--analyze-only" not in sys.argv and data:
         print("\n" + "=" * 70)
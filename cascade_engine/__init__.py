@@ -1,3 +1,3 @@
 """InnovAIte Cascade Prediction Engine"""
 from .cascade_chain import analyze_threats, analyze_from_context_json
-from .retriever import query_threats, multi_domain_query
+from .retriever import query_threats, query_threats_batch, multi_domain_query
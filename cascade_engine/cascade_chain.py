@@ -31,12 +31,18 @@ Usage:
     print(result)
 
 Requires:
-    pip install langchain langchain-groq langchain-community chromadb sentence-transformers
+    pip install langchain langchain-groq langchain-community chromadb sentence-transformers xxhash orjson
     GROQ_API_KEY environment variable set
 """
 
 import os
+import re
+import sys
 import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import xxhash
 from dotenv import load_dotenv
 
 from langchain_groq import ChatGroq
@@ -52,7 +58,7 @@ from langchain_core.runnables import RunnablePassthrough, RunnableLambda
 # )
 
 # from retriever import multi_domain_query, query_threats
-from .retriever import multi_domain_query, query_threats
+from .retriever import multi_domain_query, query_threats, query_threats_batch
 from .cascade_prompt import (
     CASCADE_PROMPT,
     JSON_SCHEMA,
@@ -60,6 +66,9 @@ from .cascade_prompt import (
     format_retrieved_context,
 )
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from llm_cache import cache_key, load_cached, save_cached
+
 
 load_dotenv()
 
@@ -70,11 +79,20 @@ load_dotenv()
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY_5", "")
 GROQ_MODEL = os.environ.get("GROQ_MODEL", "llama-3.3-70b-versatile")
 
+# Body of a reply wrapped in a ```json (or any ```lang) markdown fence; the
+# closing fence may be missing when the reply was cut short
+_FENCE_RE = re.compile(r"```[^\n]*\n(.*?)(?:```)?\s*\Z", re.S)
+
 
+@lru_cache(maxsize=None)
 def get_llm(temperature: float = 0.2):
     """
     Initialize the Groq LLM via LangChain.
     Low temperature for structured, consistent output.
+
+    One instance per temperature is kept, so every analysis reuses the same
+    Groq client and its pooled keep-alive connection (no TLS handshake per
+    call).
     """
     return ChatGroq(
         api_key=GROQ_API_KEY,
@@ -98,18 +116,11 @@ def retrieve_context_for_threats(threats: list[dict], n_per_query: int = 5) -> l
     2. Query each threat's summary against ALL domains (cross-domain cascades)
     3. Query the combined threat picture for compound event patterns
 
-    Deduplicates by document content.
+    Deduplicates by document content (xxh3 hash of the full text). Queries
+    that share a domain filter go to ChromaDB as one batched call, the
+    batches run concurrently, and results are merged in the order above.
     """
-    all_docs = []
-    seen_content = set()
-
-    def add_unique(docs):
-        for d in docs:
-            content_key = d["content"][:200]  # first 200 chars as dedup key
-            if content_key not in seen_content:
-                seen_content.add(content_key)
-                all_docs.append(d)
-
+    queries = []
     for threat in threats:
         summary = threat.get("summary", "")
         domain = threat.get("threat_type", "")
@@ -118,20 +129,47 @@ def retrieve_context_for_threats(threats: list[dict], n_per_query: int = 5) -> l
             continue
 
         # 1. Domain-specific retrieval
-        domain_docs = query_threats(summary, n=n_per_query, domain=domain)
-        add_unique(domain_docs)
+        queries.append((summary, domain))
 
         # 2. Cross-domain retrieval (finds cascade-relevant records)
-        cross_docs = query_threats(summary, n=n_per_query, domain=None)
-        add_unique(cross_docs)
+        queries.append((summary, None))
 
     # 3. Compound query — combine all threat summaries
     if len(threats) > 1:
         combined_query = " AND ".join(
             t.get("summary", t.get("threat_type", "")) for t in threats
         )
-        compound_docs = query_threats(combined_query, n=n_per_query)
-        add_unique(compound_docs)
+        queries.append((combined_query, None))
+
+    if not queries:
+        return []
+
+    # One batched query per distinct domain filter, mapped back to query order
+    by_domain = {}
+    for i, (text, domain) in enumerate(queries):
+        by_domain.setdefault(domain, []).append(i)
+    results = [None] * len(queries)
+    with ThreadPoolExecutor(max_workers=min(len(by_domain), 8)) as pool:
+        batches = {
+            domain: pool.submit(
+                query_threats_batch, [queries[i][0] for i in idx], n=n_per_query, domain=domain
+            )
+            for domain, idx in by_domain.items()
+        }
+        for domain, future in batches.items():
+            for i, docs in zip(by_domain[domain], future.result()):
+                results[i] = docs
+
+    all_docs = []
+    seen_content: set[int] = set()
+    for docs in results:
+        for d in docs:
+            # 64-bit xxh3 of the full text: small int keys, and documents that
+            # merely share an opening no longer collapse into one
+            content_key = xxhash.xxh3_64_intdigest(d["content"].encode("utf-8", "ignore"))
+            if content_key not in seen_content:
+                seen_content.add(content_key)
+                all_docs.append(d)
 
     return all_docs
 
@@ -151,6 +189,8 @@ def analyze_threats(
 
     Takes active threats from all lanes, retrieves historical context,
     sends everything to the LLM, returns structured cascade prediction.
+    Replies that parse are cached on disk by prompt content (see llm_cache),
+    so identical threats + context within 30 minutes skip the Groq call.
 
     Args:
         threats: List of standardized threat dicts from each lane
@@ -170,30 +210,37 @@ def analyze_threats(
     threats_text = format_active_threats(threats)
     context_text = format_retrieved_context(historical_docs)
 
-    # Step 3: Build and invoke the chain
-    llm = get_llm(temperature=temperature)
-
-    chain = CASCADE_PROMPT | llm | StrOutputParser()
-
-    print(f"[CASCADE] Sending to {GROQ_MODEL}...")
-    raw_response = chain.invoke({
+    # Step 3: Build and invoke the chain — unless the exact same prompt was
+    # answered recently (see llm_cache)
+    inputs = {
         "json_schema": JSON_SCHEMA,
         "active_threats": threats_text,
         "historical_context": context_text,
         "location": location,
-    })
+    }
+    key = cache_key({"model": GROQ_MODEL, "temperature": temperature, "inputs": inputs})
+    raw_response = load_cached(key)
+    fresh = raw_response is None
+    if fresh:
+        llm = get_llm(temperature=temperature)
+
+        chain = CASCADE_PROMPT | llm | StrOutputParser()
+
+        print(f"[CASCADE] Sending to {GROQ_MODEL}...")
+        raw_response = chain.invoke(inputs)
+    else:
+        print(f"[CASCADE] Reusing cached {GROQ_MODEL} response for identical inputs")
 
     # Step 4: Parse the JSON response
     try:
         # Strip markdown fences if the LLM wraps in ```json
         cleaned = raw_response.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("\n", 1)[1]  # remove first line
-        if cleaned.endswith("```"):
-            cleaned = cleaned.rsplit("```", 1)[0]
-        cleaned = cleaned.strip()
+        m = _FENCE_RE.match(cleaned)
+        cleaned = (m.group(1) if m else cleaned.removesuffix("```")).strip()
 
-        result = json.loads(cleaned)
+        result = orjson.loads(cleaned)
+        if fresh:
+            save_cached(key, raw_response)  # only replies that parse
         result["_meta"] = {
             "model": GROQ_MODEL,
             "threats_analyzed": len(threats),
@@ -206,7 +253,7 @@ def analyze_threats(
 
         return result
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         return {
             "error": "Failed to parse LLM response as JSON",
             "parse_error": str(e),
@@ -311,7 +358,6 @@ def analyze_threats(
 def _save_result(result: dict, location: str):
     """Save cascade result as both JSON and human-readable TXT."""
     from datetime import datetime
-    import json
     import os
 
     # Determine output directory — cascade_engine/output/ or Data/
@@ -326,99 +372,98 @@ def _save_result(result: dict, location: str):
 
     # ── JSON ──
     json_path = os.path.join(out_dir, f"{base_name}.json")
-    # ensure_ascii=False to keep Unicode, encoding="utf-8" to avoid cp1252 issues
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    # orjson writes UTF-8 (Unicode kept as is, no cp1252 issues)
+    with open(json_path, "wb") as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     # ── TXT (human-readable report) ──
+    # Streamed straight into the file, one write per line
     txt_path = os.path.join(out_dir, f"{base_name}.txt")
-    lines = []
-    lines.append("=" * 70)
-    lines.append("  InnovAIte CASCADE PREDICTION REPORT")
-    lines.append(f"  Location: {location}")
-    lines.append(f"  Generated: {datetime.now().isoformat()}")
-    lines.append(f"  Model: {result.get('_meta', {}).get('model', 'N/A')}")
-    lines.append("=" * 70)
-
-    lines.append(
-        f"\nOVERALL RISK: {result.get('overall_risk_level', 'N/A')} "
-        f"({result.get('overall_risk_score', '?')}/10)"
-    )
-    lines.append(f"\nBRIEFING:\n  {result.get('situation_briefing', 'N/A')}")
-
-    # Active threats
-    threats_list = result.get("active_threats_assessment", [])
-    if threats_list:
-        lines.append(f"\n{'─'*70}")
-        lines.append(f"ACTIVE THREATS ({len(threats_list)})")
-        lines.append(f"{'─'*70}")
-        for t in threats_list:
-            lines.append(
-                f"  [{t.get('severity', '?').upper()}] "
-                f"{t.get('threat_type', '?')} — {t.get('summary', '')}"
-            )
+    # FIX: write TXT with UTF-8 encoding
+    with open(txt_path, "w", encoding="utf-8") as f:
+        w = f.write
+        w("=" * 70 + "\n")
+        w("  InnovAIte CASCADE PREDICTION REPORT\n")
+        w(f"  Location: {location}\n")
+        w(f"  Generated: {datetime.now().isoformat()}\n")
+        w(f"  Model: {result.get('_meta', {}).get('model', 'N/A')}\n")
+        w("=" * 70 + "\n")
+
+        w(
+            f"\nOVERALL RISK: {result.get('overall_risk_level', 'N/A')} "
+            f"({result.get('overall_risk_score', '?')}/10)\n"
+        )
+        w(f"\nBRIEFING:\n  {result.get('situation_briefing', 'N/A')}\n")
+
+        # Active threats
+        threats_list = result.get("active_threats_assessment", [])
+        if threats_list:
+            w(f"\n{'─'*70}\n")
+            w(f"ACTIVE THREATS ({len(threats_list)})\n")
+            w(f"{'─'*70}\n")
+            for t in threats_list:
+                w(
+                    f"  [{t.get('severity', '?').upper()}] "
+                    f"{t.get('threat_type', '?')} — {t.get('summary', '')}\n"
+                )
 
-    # Cascade chains
-    cascades = result.get("cascade_predictions", [])
-    if cascades:
-        lines.append(f"\n{'─'*70}")
-        lines.append(f"CASCADE PREDICTIONS ({len(cascades)} chains)")
-        lines.append(f"{'─'*70}")
-        for c in cascades:
-            lines.append(f"\n  Chain {c.get('chain_id', '?')}: {c.get('trigger', '')}")
-            for step in c.get("cascade_steps", []):
-                lines.append(f"    → Step {step.get('step')}: {step.get('event')}")
-                lines.append(
-                    "      Domain: {d} | Probability: {p} | Timeframe: {t}".format(
-                        d=step.get("domain"),
-                        p=step.get("probability"),
-                        t=step.get("timeframe"),
+        # Cascade chains
+        cascades = result.get("cascade_predictions", [])
+        if cascades:
+            w(f"\n{'─'*70}\n")
+            w(f"CASCADE PREDICTIONS ({len(cascades)} chains)\n")
+            w(f"{'─'*70}\n")
+            for c in cascades:
+                w(f"\n  Chain {c.get('chain_id', '?')}: {c.get('trigger', '')}\n")
+                for step in c.get("cascade_steps", []):
+                    w(f"    → Step {step.get('step')}: {step.get('event')}\n")
+                    w(
+                        "      Domain: {d} | Probability: {p} | Timeframe: {t}\n".format(
+                            d=step.get("domain"),
+                            p=step.get("probability"),
+                            t=step.get("timeframe"),
+                        )
                     )
+                    w(f"      Mechanism: {step.get('mechanism')}\n")
+                w(
+                    f"    Historical precedent: {c.get('historical_precedent', 'None cited')}\n"
+                )
+                w(f"    Ultimate impact: {c.get('ultimate_impact', 'N/A')}\n")
+                w(f"    Affected: {c.get('affected_population', 'N/A')}\n")
+
+        # Priority actions
+        actions = result.get("recommended_actions", [])
+        if actions:
+            w(f"\n{'─'*70}\n")
+            w(f"RECOMMENDED ACTIONS ({len(actions)})\n")
+            w(f"{'─'*70}\n")
+            for a in actions:
+                urgency = a.get("urgency", "?")
+                w(f"  P{a.get('priority', '?')} [{urgency}]: {a.get('action')}\n")
+                w(
+                    f"    Responsible: {a.get('responsible_entity', 'N/A')}\n"
+                )
+                w(f"    Rationale: {a.get('rationale', 'N/A')}\n")
+
+        # Monitoring
+        alerts = result.get("monitoring_alerts", [])
+        if alerts:
+            w(f"\n{'─'*70}\n")
+            w(f"MONITORING ALERTS ({len(alerts)})\n")
+            w(f"{'─'*70}\n")
+            for alert in alerts:
+                w(f"  {alert.get('indicator')}\n")
+                w(
+                    f"    Threshold: {alert.get('threshold')} | "
+                    f"Source: {alert.get('data_source')}\n"
                 )
-                lines.append(f"      Mechanism: {step.get('mechanism')}")
-            lines.append(
-                f"    Historical precedent: {c.get('historical_precedent', 'None cited')}"
-            )
-            lines.append(f"    Ultimate impact: {c.get('ultimate_impact', 'N/A')}")
-            lines.append(f"    Affected: {c.get('affected_population', 'N/A')}")
-
-    # Priority actions
-    actions = result.get("recommended_actions", [])
-    if actions:
-        lines.append(f"\n{'─'*70}")
-        lines.append(f"RECOMMENDED ACTIONS ({len(actions)})")
-        lines.append(f"{'─'*70}")
-        for a in actions:
-            urgency = a.get("urgency", "?")
-            lines.append(f"  P{a.get('priority', '?')} [{urgency}]: {a.get('action')}")
-            lines.append(
-                f"    Responsible: {a.get('responsible_entity', 'N/A')}"
-            )
-            lines.append(f"    Rationale: {a.get('rationale', 'N/A')}")
-
-    # Monitoring
-    alerts = result.get("monitoring_alerts", [])
-    if alerts:
-        lines.append(f"\n{'─'*70}")
-        lines.append(f"MONITORING ALERTS ({len(alerts)})")
-        lines.append(f"{'─'*70}")
-        for alert in alerts:
-            lines.append(f"  {alert.get('indicator')}")
-            lines.append(
-                f"    Threshold: {alert.get('threshold')} | "
-                f"Source: {alert.get('data_source')}"
-            )
-
-    # Caveats
-    if result.get("confidence_notes"):
-        lines.append(f"\n{'─'*70}")
-        lines.append(f"CAVEATS:\n  {result['confidence_notes']}")
 
-    lines.append(f"\n{'='*70}")
+        # Caveats
+        if result.get("confidence_notes"):
+            w(f"\n{'─'*70}\n")
+            w(f"CAVEATS:\n  {result['confidence_notes']}\n")
 
-    # FIX: write TXT with UTF-8 encoding
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+        w(f"\n{'='*70}")
 
     print(f"[CASCADE] Saved → {json_path}")
     print(f"[CASCADE] Saved → {txt_path}")
@@ -437,8 +482,8 @@ def analyze_from_context_json(context_path: str = "../Data/Context_Json.json", l
     This is handy for the demo — you already have lane predictions
     saved in Context_Json.json from the individual predictors.
     """
-    with open(context_path, "r") as f:
-        context = json.load(f)
+    with open(context_path, "rb") as f:
+        context = orjson.loads(f.read())
 
     threats = []
     for entry in context.get("entries", []):
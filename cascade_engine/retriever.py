@@ -11,6 +11,7 @@ Usage:
 """
 
 import os
+import threading
 import chromadb
 from dotenv import load_dotenv
 
@@ -44,15 +45,18 @@ def _find_chroma_db() -> str:
 
 # ── Cached singleton ──
 _collection = None
+_collection_lock = threading.Lock()
 
 def get_collection():
-    """Get the ChromaDB collection (cached)."""
+    """Get the ChromaDB collection (cached; safe to call from worker threads)."""
     global _collection
     if _collection is None:
-        path = _find_chroma_db()
-        client = chromadb.PersistentClient(path=path)
-        _collection = client.get_collection(COLLECTION_NAME)
-        print(f"[RETRIEVER] Collection '{COLLECTION_NAME}' has {_collection.count():,} documents")
+        with _collection_lock:
+            if _collection is None:
+                path = _find_chroma_db()
+                client = chromadb.PersistentClient(path=path)
+                _collection = client.get_collection(COLLECTION_NAME)
+                print(f"[RETRIEVER] Collection '{COLLECTION_NAME}' has {_collection.count():,} documents")
     return _collection
 
 
@@ -68,29 +72,43 @@ def query_threats(query: str, n: int = 10, domain: str = None) -> list[dict]:
     Returns:
         List of {"content": str, "metadata": dict}
     """
+    return query_threats_batch([query], n=n, domain=domain)[0]
+
+
+def query_threats_batch(queries: list[str], n: int = 10, domain: str = None) -> list[list[dict]]:
+    """
+    query_threats for several queries sharing one domain filter, in a single
+    collection.query call (one batched embedding pass + ANN search).
+
+    Returns:
+        One list of {"content": str, "metadata": dict} per query, in order
+    """
     col = get_collection()
 
     kwargs = {
-        "query_texts": [query],
+        "query_texts": list(queries),
         "n_results": n if not domain else n * 3,  # over-fetch if filtering
     }
 
     results = col.query(**kwargs)
 
-    docs = []
-    for i in range(len(results["documents"][0])):
-        meta = results["metadatas"][0][i] if results["metadatas"] else {}
-        # Filter in Python — chromadb 1.5.0 where filter is bugged
-        if domain and meta.get("domain") != domain:
-            continue
-        docs.append({
-            "content": results["documents"][0][i],
-            "metadata": meta,
-        })
-        if domain and len(docs) >= n:
-            break
-
-    return docs
+    batch = []
+    for q in range(len(queries)):
+        docs = []
+        for i in range(len(results["documents"][q])):
+            meta = results["metadatas"][q][i] if results["metadatas"] else {}
+            # Filter in Python — chromadb 1.5.0 where filter is bugged
+            if domain and meta.get("domain") != domain:
+                continue
+            docs.append({
+                "content": results["documents"][q][i],
+                "metadata": meta,
+            })
+            if domain and len(docs) >= n:
+                break
+        batch.append(docs)
+
+    return batch
 
 
 def multi_domain_query(query: str, n_per_domain: int = 3) -> list[dict]:
@@ -0,0 +1,54 @@
+"""
+llm_cache.py
+============
+Small on-disk cache for LLM responses, keyed by a hash of the request.
+
+Identical prompts (same city, same data, same model) are common across
+pipeline runs; a hit skips the multi-second Groq round-trip entirely.
+
+Usage:
+    from llm_cache import cache_key, load_cached, save_cached
+
+    key = cache_key(payload)            # any orjson-serializable request
+    result = load_cached(key)
+    if result is None:
+        result = call_llm(payload)
+        save_cached(key, result)
+"""
+
+import hashlib
+import os
+import time
+
+import orjson
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data", "llm_cache")
+DEFAULT_TTL_SECONDS = 1800
+
+
+def cache_key(request) -> str:
+    """Stable hex digest of an LLM request (dict keys are sorted first)."""
+    raw = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def load_cached(key: str, ttl: float = DEFAULT_TTL_SECONDS):
+    """Return the cached value for key, or None if missing, expired or unreadable."""
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def save_cached(key: str, value) -> None:
+    """Store value under key (atomic replace, so readers never see partial files)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(value))
+    os.replace(tmp, path)